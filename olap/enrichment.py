@@ -0,0 +1,125 @@
+"""
+olap/enrichment.py
+
+Dimension enrichment for fact rows without pandas merges.
+
+A DimensionLookup is built once per dimension table. For compact integer
+keys (customer_id 1001..., product_id 101...) it keeps a dense array that
+maps `key - min_key` to a row position; for any other keys it keeps a sorted
+index searched with np.searchsorted. Attributes are then attached to the
+fact frame with one vectorized take per column, so no hash table is built
+and the fact frame is never copied. Fact keys that are missing from the
+dimension get NaN, as with `pd.merge(..., how="left")`.
+"""
+
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Use a dense array while it is at most this many times larger than the dimension table
+DENSE_MAX_FILL_RATIO = 8
+
+
+class DimensionLookup:
+    """Key-to-row lookup over one dimension table."""
+
+    def __init__(self, dim_df: pd.DataFrame, key: str, attributes: List[str]):
+        """
+        Build the lookup for a dimension table.
+
+        Parameters:
+            dim_df (pd.DataFrame): Dimension rows, one per key.
+            key (str): Name of the key column, shared with the fact table.
+            attributes (list): Dimension columns that can be attached to facts.
+
+        Raises:
+            ValueError: If a column is not found or the key column has duplicates or nulls.
+        """
+        for column in [key] + list(attributes):
+            if column not in dim_df.columns:
+                raise ValueError(f"Column name '{column}' not found in the DataFrame.")
+        keys = dim_df[key]
+        if keys.isna().any():
+            raise ValueError(f"Dimension key '{key}' contains null values.")
+        if keys.duplicated().any():
+            raise ValueError(f"Dimension key '{key}' contains duplicate values.")
+
+        self.key = key
+        self.attributes = list(attributes)
+        self.values = {attr: dim_df[attr].to_numpy() for attr in self.attributes}
+
+        keys = keys.to_numpy()
+        self.dense = None
+        self.sorted_keys = None
+        if pd.api.types.is_integer_dtype(keys.dtype) and len(keys):
+            self.min_key, self.max_key = int(keys.min()), int(keys.max())
+            span = self.max_key - self.min_key + 1
+            if span <= DENSE_MAX_FILL_RATIO * len(keys):
+                self.dense = np.full(span, -1, dtype=np.int64)
+                self.dense[keys - self.min_key] = np.arange(len(keys))
+        if self.dense is None:
+            self.order = np.argsort(keys, kind="stable")
+            self.sorted_keys = keys[self.order]
+
+    def positions(self, fact_keys) -> np.ndarray:
+        """Return the dimension row for each fact key, or -1 where the key is missing."""
+        fact_keys = pd.Series(fact_keys, copy=False)
+        missing = fact_keys.isna().to_numpy()
+
+        if self.dense is not None:
+            found = np.full(len(fact_keys), -1, dtype=np.int64)
+            if pd.api.types.is_integer_dtype(fact_keys.dtype):
+                # Integer keys stay integers, so keys above 2**53 keep their exact value
+                raw = fact_keys.to_numpy(dtype=getattr(fact_keys.dtype, "numpy_dtype", fact_keys.dtype), na_value=0)
+            elif pd.api.types.is_float_dtype(fact_keys.dtype):
+                raw = fact_keys.to_numpy(dtype=np.float64, na_value=np.nan)
+                whole = np.isfinite(raw)
+                whole[whole] = raw[whole] == np.floor(raw[whole])
+                missing = missing | ~whole
+            else:
+                return found
+            inside = ~missing & (raw >= self.min_key) & (raw <= self.max_key)
+            selected = raw[inside]
+            if selected.dtype.kind == "u" and self.min_key >= 0:
+                offsets = (selected - np.uint64(self.min_key)).astype(np.int64)
+            else:
+                # Selected keys lie between min_key and max_key, so they fit in int64
+                offsets = selected.astype(np.int64) - self.min_key
+            found[inside] = self.dense[offsets]
+            return found
+
+        raw = fact_keys.to_numpy()
+        if len(self.sorted_keys) == 0:
+            return np.full(len(raw), -1, dtype=np.int64)
+        found = np.full(len(raw), -1, dtype=np.int64)
+        lookup = raw[~missing]
+        idx = np.searchsorted(self.sorted_keys, lookup)
+        idx = np.minimum(idx, len(self.sorted_keys) - 1)
+        hit = self.sorted_keys[idx] == lookup
+        found[np.flatnonzero(~missing)[hit]] = self.order[idx[hit]]
+        return found
+
+    def attach(self, fact_df: pd.DataFrame, attributes: Optional[List[str]] = None,
+               fact_key: Optional[str] = None) -> pd.DataFrame:
+        """
+        Add dimension attributes to the fact frame as new columns.
+
+        Parameters:
+            fact_df (pd.DataFrame): Fact rows. Columns are added in place.
+            attributes (list, optional): Attributes to attach. Defaults to all of them.
+            fact_key (str, optional): Key column in the fact frame. Defaults to the dimension key.
+
+        Returns:
+            pd.DataFrame: The same fact frame with the attribute columns added.
+        """
+        fact_key = fact_key or self.key
+        if fact_key not in fact_df.columns:
+            raise ValueError(f"Column name '{fact_key}' not found in the DataFrame.")
+        rows = self.positions(fact_df[fact_key])
+        for attr in attributes or self.attributes:
+            if attr not in self.values:
+                raise ValueError(f"Attribute '{attr}' is not part of the '{self.key}' lookup.")
+            # allow_fill turns -1 into NaN and upcasts the same way a left merge does
+            fact_df[attr] = pd.api.extensions.take(self.values[attr], rows, allow_fill=True)
+        return fact_df
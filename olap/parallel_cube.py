@@ -0,0 +1,285 @@
+"""
+olap/parallel_cube.py
+
+Multi-core partitioned hash aggregation used by olap/script.py.
+
+Rows are hash-partitioned on the full group key, so every group lives in
+exactly one partition. Each worker process reads its partition from shared
+memory (the key codes and metric columns are never pickled), computes partial
+sums, counts, minimums and maximums, and sends back one small row per group.
+Sketch reducers come back packed as flat arrays rather than one object per
+group. The parent merges the partials, builds the sketch objects, finishes
+derived reducers such as mean, and restores the same group order that a
+serial `df.groupby(dimensions)` returns.
+
+Only decomposable reducers on numeric columns and the sketch reducers from
+olap/sketches.py are supported. Callers should check
+`can_aggregate_in_parallel()` first and fall back to pandas otherwise.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from olap.sketches import DDSketch, HyperLogLog, concat_packed, hash_values, is_sketch_reducer, unpack_sketches
+
+# Reducers that can be computed from per-partition partial state
+SUPPORTED_REDUCERS = ("sum", "mean", "count", "min", "max")
+
+# Partial state each reducer needs from the workers
+_PARTIALS_FOR_REDUCER = {
+    "sum": ("sum",),
+    "mean": ("sum", "count"),
+    "count": ("count",),
+    "min": ("min",),
+    "max": ("max",),
+}
+
+# Below this many rows, process start-up costs more than the groupby itself
+PARALLEL_MIN_ROWS = 100_000
+
+ArraySpec = Tuple[str, Tuple[int, ...], str]
+
+
+def _as_reducer_list(aggs: Union[str, List[str]]) -> List[str]:
+    """Return the reducers for one metric column as a list."""
+    return list(aggs) if isinstance(aggs, (list, tuple)) else [aggs]
+
+
+def can_aggregate_in_parallel(df: pd.DataFrame, dimensions: list, metrics: dict,
+                              list_column: Optional[str] = None) -> bool:
+    """Return True if the parallel engine gives the same cube as pandas for these inputs."""
+    if not dimensions:
+        return False
+    for dim in dimensions:
+        if dim not in df.columns or isinstance(df[dim].dtype, pd.CategoricalDtype):
+            return False
+    for col, aggs in metrics.items():
+        if col not in df.columns:
+            return False
+        funcs = _as_reducer_list(aggs)
+        if any(func not in SUPPORTED_REDUCERS and not is_sketch_reducer(func) for func in funcs):
+            return False
+        # HyperLogLog only needs value hashes; everything else reads the raw numbers
+        if any(func != "hll" for func in funcs):
+            if not pd.api.types.is_numeric_dtype(df[col]) or pd.api.types.is_bool_dtype(df[col]):
+                return False
+            if pd.api.types.is_extension_array_dtype(df[col]):
+                return False
+    if list_column is not None:
+        if list_column not in df.columns or not pd.api.types.is_numeric_dtype(df[list_column]):
+            return False
+        if pd.api.types.is_extension_array_dtype(df[list_column]):
+            return False
+    return True
+
+
+def _hash_partitions(codes: List[np.ndarray], n_partitions: int) -> np.ndarray:
+    """Assign each row to a partition by hashing its combined key codes."""
+    h = np.zeros(len(codes[0]), dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for col in codes:
+            h = (h * np.uint64(0x100000001B3)) ^ col.astype(np.uint64)
+        # splitmix64 finalizer so that neighbouring keys spread across partitions
+        h ^= h >> np.uint64(30)
+        h *= np.uint64(0xBF58476D1CE4E5B9)
+        h ^= h >> np.uint64(27)
+        h *= np.uint64(0x94D049BB133111EB)
+        h ^= h >> np.uint64(31)
+    return (h % np.uint64(n_partitions)).astype(np.int32)
+
+
+def _to_shared(arr: np.ndarray, blocks: List[shared_memory.SharedMemory]) -> ArraySpec:
+    """Copy an array into a new shared memory block and return its spec."""
+    arr = np.ascontiguousarray(arr)
+    shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+    blocks.append(shm)
+    np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+    return shm.name, arr.shape, arr.dtype.str
+
+
+def _attach(spec: ArraySpec) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    """Attach to a shared memory block created by the parent process."""
+    name, shape, dtype = spec
+    try:
+        shm = shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 has no track flag; workers share the parent's resource
+        # tracker, so the parent's unlink still clears the registration
+        shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+
+
+def _aggregate_partition(partition: int, part_spec: ArraySpec, key_specs: List[ArraySpec],
+                         value_specs: Dict[str, ArraySpec], partials: Dict[str, List[str]],
+                         sketches: List[Tuple[str, str]], list_spec: Optional[ArraySpec]) -> dict:
+    """Worker: compute partial aggregates for the rows of one partition."""
+    attached = []
+    try:
+        shm, part = _attach(part_spec)
+        attached.append(shm)
+        rows = np.flatnonzero(part == partition)
+
+        frame = {}
+        for i, spec in enumerate(key_specs):
+            shm, arr = _attach(spec)
+            attached.append(shm)
+            frame[f"_k{i}"] = arr[rows]
+        for col, spec in value_specs.items():
+            shm, arr = _attach(spec)
+            attached.append(shm)
+            frame[col] = arr[rows]
+        list_values = None
+        if list_spec is not None:
+            shm, arr = _attach(list_spec)
+            attached.append(shm)
+            list_values = arr[rows]
+    finally:
+        # Views above were copied by fancy indexing, so the blocks can be released now
+        for shm in attached:
+            shm.close()
+
+    key_cols = [f"_k{i}" for i in range(len(key_specs))]
+    if len(rows) == 0:
+        return {"keys": [np.empty(0, dtype=np.int64) for _ in key_cols], "partials": {},
+                "sketches": {}, "lists": []}
+
+    sub = pd.DataFrame(frame, copy=False)
+    grouped = sub.groupby(key_cols, sort=True)
+    agg = grouped.agg(partials) if partials else grouped.size()
+    keys = [agg.index.get_level_values(i).to_numpy() for i in range(len(key_cols))]
+    result = {
+        "keys": keys,
+        "partials": {(col, p): agg[(col, p)].to_numpy() for col, ps in partials.items() for p in ps},
+        "sketches": {},
+        "lists": [],
+    }
+
+    if sketches:
+        group_ids = grouped.ngroup().to_numpy()
+        for col, func in sketches:
+            # Flat arrays pickle in one piece; one object per group would not
+            if func == "hll":
+                ids = np.where(sub[f"{col}#valid"].to_numpy(), group_ids, -1)
+                packed = HyperLogLog.packed_from_hashes(sub[f"{col}#hash"].to_numpy(), ids, len(agg))
+            else:
+                packed = DDSketch.packed_from_values(sub[col].to_numpy(dtype=np.float64), group_ids, len(agg))
+            result["sketches"][(col, func)] = packed
+
+    if list_values is not None:
+        # lexsort is stable, so values keep their original row order within each group
+        order = np.lexsort([sub[k].to_numpy() for k in reversed(key_cols)])
+        sorted_keys = np.column_stack([sub[k].to_numpy()[order] for k in key_cols])
+        bounds = np.flatnonzero((sorted_keys[1:] != sorted_keys[:-1]).any(axis=1)) + 1
+        result["lists"] = [chunk.tolist() for chunk in np.split(list_values[order], bounds)]
+    return result
+
+
+def _merge_partials(results: List[dict], n_keys: int, partials: Dict[str, List[str]],
+                    sketches: List[Tuple[str, str]]) -> Tuple[List[np.ndarray], dict, list, np.ndarray]:
+    """Concatenate worker partials and return them with the serial groupby order."""
+    keys = [np.concatenate([r["keys"][i] for r in results]) for i in range(n_keys)]
+    filled = [r for r in results if len(r["keys"][0])]
+    merged = {(col, p): np.concatenate([r["partials"][(col, p)] for r in filled]) if filled else np.empty(0)
+              for col, ps in partials.items() for p in ps}
+    for col, func in sketches:
+        merged[(col, func)] = (unpack_sketches(func, concat_packed([r["sketches"][(col, func)] for r in filled]))
+                               if filled else [])
+    lists = [group for r in results for group in r["lists"]]
+    # Partitions hold disjoint groups, so merging is a reorder by key codes
+    order = np.lexsort(list(reversed(keys)))
+    return keys, merged, lists, order
+
+
+def parallel_groupby_agg(df: pd.DataFrame, dimensions: list, metrics: dict,
+                         list_column: Optional[str] = None,
+                         workers: Optional[int] = None) -> Tuple[pd.DataFrame, Optional[list]]:
+    """
+    Aggregate `df` by `dimensions` across worker processes.
+
+    Parameters:
+        df (pd.DataFrame): Fact rows to aggregate.
+        dimensions (list): Group-by columns.
+        metrics (dict): Column to reducer name (or list of names), as for DataFrame.agg.
+        list_column (str, optional): Column whose values are also collected per group.
+        workers (int, optional): Number of worker processes. Defaults to os.cpu_count().
+
+    Returns:
+        tuple: (cube, lists), where `cube` has the dimension columns followed by one
+               `{column}_{reducer}` column per metric, in serial groupby order, and
+               `lists` holds the collected `list_column` values per group (or None).
+    """
+    if not can_aggregate_in_parallel(df, dimensions, metrics, list_column):
+        raise ValueError("Inputs are not supported by the parallel aggregation engine.")
+    workers = workers or os.cpu_count() or 1
+
+    # Factorize each dimension with sorted codes so that code order matches value order
+    codes, uniques = [], []
+    for dim in dimensions:
+        dim_codes, dim_uniques = pd.factorize(df[dim], sort=True)
+        codes.append(dim_codes.astype(np.int64, copy=False))
+        uniques.append(dim_uniques)
+
+    # groupby drops rows with a missing key by default
+    valid = np.logical_and.reduce([c >= 0 for c in codes])
+    partition = _hash_partitions(codes, workers)
+    partition[~valid] = -1
+
+    partials: Dict[str, List[str]] = {}
+    sketches: List[Tuple[str, str]] = []
+    for col, aggs in metrics.items():
+        needed = []
+        for func in _as_reducer_list(aggs):
+            if is_sketch_reducer(func):
+                sketches.append((col, func))
+            else:
+                needed.extend(p for p in _PARTIALS_FOR_REDUCER[func] if p not in needed)
+        if needed:
+            partials[col] = needed
+
+    blocks: List[shared_memory.SharedMemory] = []
+    try:
+        part_spec = _to_shared(partition, blocks)
+        key_specs = [_to_shared(c, blocks) for c in codes]
+        value_specs = {}
+        for col in metrics:
+            if col in partials or (col, "ddsketch") in sketches:
+                value_specs[col] = _to_shared(df[col].to_numpy(), blocks)
+            if (col, "hll") in sketches:
+                value_specs[f"{col}#hash"] = _to_shared(hash_values(df[col].to_numpy()), blocks)
+                value_specs[f"{col}#valid"] = _to_shared(df[col].notna().to_numpy(), blocks)
+        list_spec = _to_shared(df[list_column].to_numpy(), blocks) if list_column else None
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_aggregate_partition, p, part_spec, key_specs,
+                                   value_specs, partials, sketches, list_spec)
+                       for p in range(workers)]
+            results = [f.result() for f in futures]
+    finally:
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
+
+    keys, merged, lists, order = _merge_partials(results, len(dimensions), partials, sketches)
+
+    cube = {}
+    for dim, dim_codes, dim_uniques in zip(dimensions, keys, uniques):
+        cube[dim] = dim_uniques.take(dim_codes[order])
+    for col, aggs in metrics.items():
+        for func in _as_reducer_list(aggs):
+            if is_sketch_reducer(func):
+                cube[f"{col}_{func}"] = [merged[(col, func)][i] for i in order]
+                continue
+            if func == "mean":
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    values = merged[(col, "sum")] / merged[(col, "count")]
+            else:
+                values = merged[(col, func)]
+            cube[f"{col}_{func}"] = values[order]
+
+    lists_out = [lists[i] for i in order] if list_column else None
+    return pd.DataFrame(cube), lists_out
@@ -0,0 +1,240 @@
+"""
+olap/rolling_features.py
+
+Rolling-window sales features per store, customer and product.
+
+For every store_id, customer_id and product_id, and every day that key had
+sales, this stage computes:
+
+- sales_sum_{N}d and sales_count_{N}d: sale_amount total and number of sales
+  in the N days ending on that day, for N in WINDOWS (7, 28 and 90). A sale
+  with a missing sale_amount adds to the count but not to the total.
+- days_since_last_purchase: days since the previous day that key had a sale
+
+Sales are first reduced to one row per key and day, sorted by key and day.
+Each window is then one cumulative sum plus one vectorized search for where
+the window starts, instead of a per-group apply.
+
+Runs are incremental. The transaction ids already processed are recorded in
+the warehouse, and the next run reads only the sales it has not seen. Recent
+daily rows per key are saved as window state: the last max(WINDOWS) +
+LATE_DAYS days, plus each key's last day before that. New sales are combined
+with the state, and features are recomputed for each affected key from its
+earliest new day on, so a store's late drop for a day that was already
+processed updates that day and the days after it.
+
+Sales dated LATE_DAYS or more days before the latest processed day are too
+old to recompute from the state. They are counted, reported and skipped.
+
+To run it, open a terminal in the root project folder and run:
+
+py olap\\rolling_features.py
+python3 olap/rolling_features.py
+"""
+
+import sqlite3
+import pathlib
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Constants
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+DW_DIR = PROJECT_ROOT / "data" / "dw"
+DB_PATH = DW_DIR / "smart_sales.db"
+FEATURES_TABLE = "sale_rolling_features"
+STATE_TABLE = "sale_rolling_state"
+PROCESSED_TABLE = "sale_rolling_processed"
+
+KEY_COLUMNS = ["store_id", "customer_id", "product_id"]
+WINDOWS = (7, 28, 90)
+
+# How many days before the latest processed day a late sale can still be applied
+LATE_DAYS = 28
+
+
+def daily_sales_by_key(sales_df: pd.DataFrame) -> pd.DataFrame:
+    """Reduce sales to one row per key and day, sorted by key_type, key_id and day."""
+    days = pd.to_datetime(sales_df["sale_date"]).to_numpy().astype("datetime64[D]").astype(np.int64)
+    frames = []
+    for key_column in KEY_COLUMNS:
+        daily = (pd.DataFrame({"key_id": sales_df[key_column].to_numpy(), "day": days,
+                               "sale_amount": sales_df["sale_amount"].to_numpy()})
+                 .dropna(subset=["key_id"])
+                 .groupby(["key_id", "day"], sort=True)["sale_amount"]
+                 # size counts every sale, including one with a missing sale_amount
+                 .agg(daily_sum="sum", daily_count="size")
+                 .reset_index())
+        daily.insert(0, "key_type", key_column)
+        frames.append(daily)
+    return pd.concat(frames, ignore_index=True)
+
+
+def compute_rolling_features(daily: pd.DataFrame, windows: Tuple[int, ...] = WINDOWS) -> pd.DataFrame:
+    """Compute window sums, counts and days since last purchase for sorted daily rows."""
+    daily = daily.sort_values(["key_type", "key_id", "day"], kind="stable", ignore_index=True)
+    day = daily["day"].to_numpy(dtype=np.int64)
+    n = len(daily)
+
+    key_type, key_id = daily["key_type"].to_numpy(), daily["key_id"].to_numpy()
+    new_key = np.ones(n, dtype=bool)
+    new_key[1:] = (key_type[1:] != key_type[:-1]) | (key_id[1:] != key_id[:-1])
+    key_code = np.cumsum(new_key) - 1
+
+    # One sorted composite (key, day) value per row; the stride keeps windows inside one key
+    offset = day - (day.min() if n else 0)
+    stride = (offset.max() if n else 0) + max(windows) + 1
+    position = key_code * stride + offset
+
+    amount_totals = np.concatenate(([0.0], np.cumsum(daily["daily_sum"].to_numpy(dtype=np.float64))))
+    count_totals = np.concatenate(([0], np.cumsum(daily["daily_count"].to_numpy(dtype=np.int64))))
+    ends = np.arange(1, n + 1)
+
+    features = daily[["key_type", "key_id", "day"]].copy()
+    for window in windows:
+        starts = np.searchsorted(position, position - window + 1, side="left")
+        features[f"sales_sum_{window}d"] = amount_totals[ends] - amount_totals[starts]
+        features[f"sales_count_{window}d"] = count_totals[ends] - count_totals[starts]
+
+    gap = np.zeros(n, dtype=np.int64)
+    gap[1:] = day[1:] - day[:-1]
+    days_since = pd.array(gap, dtype="Int64")
+    days_since[new_key] = pd.NA
+    features["days_since_last_purchase"] = days_since
+    return features
+
+
+def trim_window_state(daily: pd.DataFrame, windows: Tuple[int, ...] = WINDOWS,
+                      late_days: int = LATE_DAYS) -> pd.DataFrame:
+    """
+    Keep the sorted daily rows later runs need.
+
+    That is the last max(windows) + late_days days, so windows of late days can be
+    recomputed, plus each key's last day before them for days_since_last_purchase.
+    """
+    if daily.empty:
+        return daily
+    cutoff = daily["day"].max() - max(windows) - late_days
+    keep = daily["day"].to_numpy() > cutoff
+    before = np.flatnonzero(~keep)
+    last_before = ~daily.iloc[before].duplicated(["key_type", "key_id"], keep="last").to_numpy()
+    keep[before[last_before]] = True
+    return daily[keep].reset_index(drop=True)
+
+
+def update_rolling_features(new_sales: pd.DataFrame, state: Optional[pd.DataFrame] = None,
+                            windows: Tuple[int, ...] = WINDOWS,
+                            late_days: int = LATE_DAYS) -> Tuple[pd.DataFrame, pd.DataFrame, int]:
+    """
+    Compute features for sales not processed before and return the updated state.
+
+    Parameters:
+        new_sales (pd.DataFrame): Sales not processed before, with sale_date, sale_amount and the KEY_COLUMNS.
+                                  They may be dated before days that were already processed.
+        state (pd.DataFrame, optional): Window state from the previous run, or None to start fresh.
+        windows (tuple, optional): Window lengths in days.
+        late_days (int, optional): Sales dated this many days or more before the state's last day are skipped.
+
+    Returns:
+        tuple: (features, state, skipped), where `features` has one row per affected key and day
+               (each key's days from its earliest new sale on, which may replace earlier rows)
+               and `skipped` is the number of sales too late to apply.
+    """
+    skipped = 0
+    if state is not None and not state.empty:
+        horizon = day_to_timestamp(state["day"].max() - late_days)
+        too_late = (pd.to_datetime(new_sales["sale_date"]) <= horizon).to_numpy()
+        skipped = int(too_late.sum())
+        new_sales = new_sales[~too_late]
+
+    new_daily = daily_sales_by_key(new_sales)
+    if state is None or state.empty:
+        combined = new_daily
+    else:
+        # Late sales can add to days already in the state
+        combined = (pd.concat([state, new_daily], ignore_index=True)
+                    .groupby(["key_type", "key_id", "day"], sort=True, as_index=False)
+                    [["daily_sum", "daily_count"]].sum())
+    features = compute_rolling_features(combined, windows)
+
+    # Every day from a key's earliest new day on has a new window or a new previous day
+    first_new_day = new_daily.groupby(["key_type", "key_id"], as_index=False)["day"].min()
+    features = features.merge(first_new_day.rename(columns={"day": "first_new_day"}), on=["key_type", "key_id"])
+    features = (features[features["day"] >= features.pop("first_new_day")]
+                .sort_values(["key_type", "key_id", "day"], kind="stable", ignore_index=True))
+
+    combined = combined.sort_values(["key_type", "key_id", "day"], kind="stable", ignore_index=True)
+    return features, trim_window_state(combined, windows, late_days), skipped
+
+
+def day_to_timestamp(day: int) -> pd.Timestamp:
+    """Convert a day number (days since 1970-01-01) to a timestamp."""
+    return pd.Timestamp(np.datetime64(int(day), "D"))
+
+
+def with_sale_dates(df: pd.DataFrame) -> pd.DataFrame:
+    """Replace the day number column with an ISO sale_date column for the warehouse."""
+    df = df.copy()
+    df.insert(df.columns.get_loc("day"), "sale_date",
+              df["day"].to_numpy().astype("datetime64[D]").astype(str))
+    return df.drop(columns=["day"])
+
+
+def table_exists(conn: sqlite3.Connection, table: str) -> bool:
+    """Return True if the table exists in the database."""
+    return conn.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = ?",
+                        (table,)).fetchone() is not None
+
+
+def load_window_state(conn: sqlite3.Connection) -> Optional[pd.DataFrame]:
+    """Load the window state saved by the previous run, or None if there is none."""
+    # State saved without a record of processed sales cannot be continued
+    if not (table_exists(conn, STATE_TABLE) and table_exists(conn, PROCESSED_TABLE)):
+        return None
+    state = pd.read_sql_query(f"SELECT * FROM {STATE_TABLE}", conn)
+    state["day"] = pd.to_datetime(state.pop("sale_date")).to_numpy().astype("datetime64[D]").astype(np.int64)
+    return state[["key_type", "key_id", "day", "daily_sum", "daily_count"]]
+
+
+def main() -> None:
+    """Update rolling-window sales features in the data warehouse."""
+    print("Starting rolling sales feature update...")
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        state = load_window_state(conn)
+        query = f"SELECT transaction_id, {', '.join(KEY_COLUMNS)}, sale_amount, sale_date FROM sale"
+        if state is None:
+            # Without saved state the features are rebuilt from all history
+            conn.execute(f"DROP TABLE IF EXISTS {FEATURES_TABLE}")
+            conn.execute(f"DROP TABLE IF EXISTS {PROCESSED_TABLE}")
+            conn.execute(f"CREATE TABLE {PROCESSED_TABLE} (transaction_id INTEGER PRIMARY KEY)")
+        else:
+            # Read by what was ingested, not by date, so late drops for processed days are not missed
+            query += f" WHERE transaction_id NOT IN (SELECT transaction_id FROM {PROCESSED_TABLE})"
+        new_sales = pd.read_sql_query(query, conn)
+
+        features, state, skipped = update_rolling_features(new_sales, state)
+        features = with_sale_dates(features)
+        if table_exists(conn, FEATURES_TABLE):
+            # Recomputed days replace the rows written for them by earlier runs
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {FEATURES_TABLE}_key_day "
+                         f"ON {FEATURES_TABLE} (key_type, key_id, sale_date)")
+            conn.executemany(f"DELETE FROM {FEATURES_TABLE} WHERE key_type = ? AND key_id = ? AND sale_date = ?",
+                             features[["key_type", "key_id", "sale_date"]].itertuples(index=False, name=None))
+        features.to_sql(FEATURES_TABLE, conn, if_exists="append", index=False)
+        with_sale_dates(state).to_sql(STATE_TABLE, conn, if_exists="replace", index=False)
+        conn.executemany(f"INSERT OR IGNORE INTO {PROCESSED_TABLE} (transaction_id) VALUES (?)",
+                         ((int(tid),) for tid in new_sales["transaction_id"]))
+        conn.commit()
+        print(f"Wrote {len(features)} feature rows to {FEATURES_TABLE} from {len(new_sales)} new sales; "
+              f"kept {len(state)} rows of window state.")
+        if skipped:
+            print(f"WARNING: skipped {skipped} sales dated {LATE_DAYS} or more days before the latest "
+                  f"processed day; rebuild the features (drop {STATE_TABLE}) to include them.")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,39 +2,42 @@ import pandas as pd
 import sqlite3
 import pathlib
 import sys
+import os
 
 # Add project root to Python path for local imports
 PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.append(str(PROJECT_ROOT))
 
+from olap.parallel_cube import PARALLEL_MIN_ROWS, can_aggregate_in_parallel, parallel_groupby_agg  # noqa: E402
+from olap.enrichment import DimensionLookup  # noqa: E402
+from olap.sketches import HyperLogLog, build_sketch_column, merge_sketches, split_sketch_metrics  # noqa: E402
+
 # Constants
-DW_DIR = pathlib.Path("data") / "dw"
+DW_DIR = PROJECT_ROOT / "data" / "dw"
 DB_PATH = DW_DIR / "smart_sales.db"
-OLAP_OUTPUT_DIR = pathlib.Path("data") / "olap_cubing_outputs"
-
-# Create output folder if it doesn't exist
-OLAP_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+OLAP_OUTPUT_DIR = PROJECT_ROOT / "data" / "olap_cubing_outputs"
 
 
 def load_sales_data() -> pd.DataFrame:
-    """Load sales and customer data, then merge them on customer_id."""
+    """Load sales data and enrich it with customer region and product category and supplier."""
     try:
         conn = sqlite3.connect(DB_PATH)
         sales_df = pd.read_sql_query("SELECT * FROM sale", conn)
-        customers_df = pd.read_sql_query("SELECT * FROM customer", conn)
+        customers_df = pd.read_sql_query("SELECT customer_id, region FROM customer", conn)
+        products_df = pd.read_sql_query("SELECT product_id, category, supplier FROM product", conn)
         conn.close()
 
-        # Merge sales and customer data on customer_id
-        merged_df = pd.merge(sales_df, customers_df[["customer_id", "region"]], on="customer_id", how="left")
-        print("Sales and customer data successfully loaded and merged.")
-        return merged_df
+        # Attach dimension attributes with array lookups instead of merging frames
+        DimensionLookup(customers_df, "customer_id", ["region"]).attach(sales_df)
+        DimensionLookup(products_df, "product_id", ["category", "supplier"]).attach(sales_df)
+        print("Sales data successfully loaded and enriched with customer and product attributes.")
+        return sales_df
     except Exception as e:
-        print(f"Error loading or merging data: {e}")
+        print(f"Error loading or enriching data: {e}")
         raise
 
 
-
 def generate_column_names(dimensions: list, metrics: dict) -> list:
     """Generate clear column names for the OLAP cube."""
     columns = dimensions.copy()
@@ -47,13 +50,35 @@ def generate_column_names(dimensions: list, metrics: dict) -> list:
     return [col.rstrip("_") for col in columns]
 
 
-def create_olap_cube(df: pd.DataFrame, dimensions: list, metrics: dict) -> pd.DataFrame:
-    """Aggregate sales data into an OLAP cube format."""
+def create_olap_cube(df: pd.DataFrame, dimensions: list, metrics: dict, workers: int = 1,
+                     min_parallel_rows: int = PARALLEL_MIN_ROWS) -> pd.DataFrame:
+    """Aggregate sales data into an OLAP cube format, in parallel when workers > 1.
+
+    Besides pandas reducers, metrics may use the sketch reducers "hll" (approximate
+    distinct count) and "ddsketch" (approximate quantiles); see olap/sketches.py.
+    """
     try:
+        if (workers > 1 and len(df) >= min_parallel_rows
+                and can_aggregate_in_parallel(df, dimensions, metrics, "transaction_id")):
+            cube, transaction_ids = parallel_groupby_agg(df, dimensions, metrics, "transaction_id", workers)
+            cube["transaction_ids"] = transaction_ids
+            cube.columns = generate_column_names(dimensions, metrics) + ["transaction_ids"]
+            print(f"OLAP cube created using dimensions: {dimensions} ({workers} workers)")
+            return cube
+
         grouped = df.groupby(dimensions)
-        cube = grouped.agg(metrics).reset_index()
+        pandas_metrics, sketches = split_sketch_metrics(metrics)
+        if pandas_metrics:
+            cube = grouped.agg(pandas_metrics).reset_index()
+            cube.columns = generate_column_names(dimensions, pandas_metrics)
+        else:
+            cube = grouped.size().reset_index()[dimensions]
+        if sketches:
+            group_ids = grouped.ngroup().fillna(-1).to_numpy(dtype="int64")
+            for col, func in sketches:
+                cube[f"{col}_{func}"] = build_sketch_column(func, df[col], group_ids, grouped.ngroups)
         cube["transaction_ids"] = grouped["transaction_id"].apply(list).reset_index(drop=True)
-        cube.columns = generate_column_names(dimensions, metrics) + ["transaction_ids"]
+        cube = cube[generate_column_names(dimensions, metrics) + ["transaction_ids"]]
         print(f"OLAP cube created using dimensions: {dimensions}")
         return cube
     except Exception as e:
@@ -61,9 +86,44 @@ def create_olap_cube(df: pd.DataFrame, dimensions: list, metrics: dict) -> pd.Da
         raise
 
 
+def rollup_cube(cube: pd.DataFrame, dimensions: list) -> pd.DataFrame:
+    """Roll a cube up to coarser dimensions by merging cells instead of rescanning facts.
+
+    Columns ending in _sum and _count are added, _min and _max are reduced, sketch
+    columns (_hll, _ddsketch) are merged, and _mean is recomputed from the matching
+    _sum and _count columns. Other columns are dropped.
+    """
+    try:
+        grouped = cube.groupby(dimensions)
+        rules = {}
+        for col in cube.columns.difference(dimensions, sort=False):
+            if col.endswith(("_sum", "_count")):
+                rules[col] = "sum"
+            elif col.endswith(("_min", "_max")):
+                rules[col] = col.rsplit("_", 1)[1]
+            elif col.endswith(("_hll", "_ddsketch")):
+                rules[col] = merge_sketches
+            elif col == "transaction_ids":
+                rules[col] = lambda ids: [i for cell in ids for i in cell]
+        rolled = grouped.agg(rules).reset_index()
+
+        for col in cube.columns:
+            base = col[:-len("_mean")]
+            if col.endswith("_mean") and f"{base}_sum" in rolled and f"{base}_count" in rolled:
+                rolled[col] = rolled[f"{base}_sum"] / rolled[f"{base}_count"]
+        rolled = rolled[dimensions + [col for col in cube.columns if col not in dimensions and col in rolled]]
+        print(f"OLAP cube rolled up to dimensions: {dimensions}")
+        return rolled
+    except Exception as e:
+        print(f"Error during OLAP cube rollup: {e}")
+        raise
+
+
 def save_cube_to_csv(cube: pd.DataFrame, filename: str) -> None:
     """Save the OLAP cube as a CSV file."""
     try:
+        # Create output folder if it doesn't exist
+        OLAP_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
         output_path = OLAP_OUTPUT_DIR / filename
         cube.to_csv(output_path, index=False)
         print(f"OLAP cube saved to: {output_path}")
@@ -93,12 +153,29 @@ def main():
         "sale_amount": ["sum", "mean"],
         "transaction_id": "count"
     }
+    # The in-memory cube also keeps what rollups need: counts for means and sketches to merge
+    rollup_metrics = {
+        "sale_amount": ["sum", "mean", "count", "ddsketch"],
+        "transaction_id": "count",
+        "customer_id": "hll",
+        "product_id": "hll"
+    }
 
     # Step 4: Create OLAP cube
-    cube = create_olap_cube(df, dimensions, metrics)
-
-    # Step 5: Save the result
-    save_cube_to_csv(cube, "multidimensional_olap_cube.csv")
+    cube = create_olap_cube(df, dimensions, rollup_metrics, workers=os.cpu_count() or 1)
+
+    # Step 5: Save the result with the published columns only
+    save_cube_to_csv(cube[generate_column_names(dimensions, metrics) + ["transaction_ids"]],
+                     "multidimensional_olap_cube.csv")
+
+    # Step 6: Roll up to region and month, merging sketches for unique buyers and percentiles
+    region_month = rollup_cube(cube, ["region", "month", "month_name"])
+    region_month["unique_customers"] = region_month["customer_id_hll"].map(HyperLogLog.estimate)
+    region_month["unique_products"] = region_month["product_id_hll"].map(HyperLogLog.estimate)
+    for q in (0.5, 0.9):
+        region_month[f"sale_amount_p{int(q * 100)}"] = region_month["sale_amount_ddsketch"].map(
+            lambda sketch: sketch.quantile(q))
+    save_cube_to_csv(region_month, "region_month_olap_cube.csv")
 
     print("OLAP cube generation completed.")
 
@@ -0,0 +1,391 @@
+"""
+olap/sketches.py
+
+Mergeable sketch metrics for the OLAP cube.
+
+- HyperLogLog gives approximate distinct counts (for example, unique buyers).
+- DDSketch gives approximate quantiles with a bounded relative error
+  (for example, sale_amount percentiles).
+
+Both are stored per cube cell and can be merged, so coarser levels of the
+cube are built from finer cells without rescanning the fact rows.
+Registers and buckets are kept sparse because most fine-grained cells only
+see a handful of values.
+
+Use them in a metrics dict with the reducer names in SKETCH_REDUCERS:
+
+    metrics = {"customer_id": "hll", "sale_amount": ["sum", "ddsketch"]}
+
+Sketch columns write to CSV as compact strings that `sketch_from_string()`
+reads back. Sketches for many groups can also be held "packed": the lengths
+of each group's registers or buckets plus the flat arrays of all groups back
+to back. The parallel cube workers return this form, which is cheap to
+pickle, and the parent builds the sketch objects with `unpack_sketches()`.
+"""
+
+import base64
+import math
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def hash_values(values) -> np.ndarray:
+    """Return stable 64-bit hashes for an array-like of values."""
+    return pd.util.hash_array(np.asarray(values), categorize=False)
+
+
+def _group_boundaries(sorted_ids: np.ndarray) -> np.ndarray:
+    """Return the start offset of each run in an array of sorted ids."""
+    if len(sorted_ids) == 0:
+        return np.empty(0, dtype=np.intp)
+    return np.concatenate(([0], np.flatnonzero(sorted_ids[1:] != sorted_ids[:-1]) + 1))
+
+
+class HyperLogLog:
+    """Sparse HyperLogLog sketch for approximate distinct counts."""
+
+    def __init__(self, precision: int = 12, indices: Optional[np.ndarray] = None,
+                 ranks: Optional[np.ndarray] = None):
+        """
+        Initialize an empty sketch, or one with the given non-zero registers.
+
+        Parameters:
+            precision (int): Number of index bits, 4 to 16. Standard error is about 1.04 / sqrt(2**precision).
+            indices (np.ndarray, optional): Sorted register indices with a non-zero rank.
+            ranks (np.ndarray, optional): Rank stored in each of those registers.
+        """
+        if not 4 <= precision <= 16:
+            raise ValueError(f"HyperLogLog precision must be between 4 and 16, got {precision}.")
+        self.precision = precision
+        self.indices = np.empty(0, dtype=np.uint16) if indices is None else indices.astype(np.uint16, copy=False)
+        self.ranks = np.empty(0, dtype=np.uint8) if ranks is None else ranks.astype(np.uint8, copy=False)
+
+    @staticmethod
+    def _registers(hashes: np.ndarray, precision: int):
+        """Split 64-bit hashes into register indices and ranks."""
+        hashes = hashes.astype(np.uint64, copy=False)
+        width = 64 - precision
+        idx = (hashes >> np.uint64(width)).astype(np.int64)
+        rest = hashes & np.uint64((1 << width) - 1)
+        # bit_length(rest) via log2, corrected where float rounding overshoots
+        bit_length = np.zeros(len(rest), dtype=np.int64)
+        nonzero = rest > 0
+        bl = np.floor(np.log2(rest[nonzero].astype(np.float64))).astype(np.int64) + 1
+        overshoot = (rest[nonzero] >> (bl - 1).astype(np.uint64)) == 0
+        bl[overshoot] -= 1
+        bit_length[nonzero] = bl
+        return idx, (width - bit_length + 1).astype(np.uint8)
+
+    @classmethod
+    def packed_from_hashes(cls, hashes: np.ndarray, group_ids: np.ndarray, n_groups: int,
+                           precision: int = 12) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Build packed sketches, one per group, from row hashes and group ids (-1 rows are skipped).
+
+        Returns:
+            tuple: (lengths, indices, ranks), the non-zero registers of all groups back to back.
+        """
+        keep = group_ids >= 0
+        idx, rank = cls._registers(hashes[keep], precision)
+        cell = group_ids[keep].astype(np.int64) * (1 << precision) + idx
+
+        # Keep the highest rank per (group, register)
+        order = np.lexsort((rank, cell))
+        cell, rank = cell[order], rank[order]
+        starts = _group_boundaries(cell)
+        last = np.append(starts[1:], len(cell)) - 1
+        cell, rank = cell[last], rank[last]
+
+        groups = cell >> precision
+        indices = cell & ((1 << precision) - 1)
+        return np.bincount(groups, minlength=n_groups), indices, rank
+
+    @classmethod
+    def from_packed(cls, lengths: np.ndarray, indices: np.ndarray, ranks: np.ndarray,
+                    precision: int = 12) -> List["HyperLogLog"]:
+        """Build one sketch per group from packed registers."""
+        bounds = np.cumsum(lengths)[:-1]
+        return [cls(precision, i, r) for i, r in zip(np.split(indices, bounds), np.split(ranks, bounds))]
+
+    @classmethod
+    def from_hashes(cls, hashes: np.ndarray, group_ids: np.ndarray, n_groups: int,
+                    precision: int = 12) -> List["HyperLogLog"]:
+        """Build one sketch per group from row hashes and group ids (-1 rows are skipped)."""
+        return cls.from_packed(*cls.packed_from_hashes(hashes, group_ids, n_groups, precision), precision)
+
+    def add(self, values) -> "HyperLogLog":
+        """Add values to the sketch in place and return it."""
+        values = pd.Series(values).dropna().to_numpy()
+        (added,) = self.from_hashes(hash_values(values), np.zeros(len(values), dtype=np.int64), 1,
+                                    self.precision)
+        merged = self.merge(added)
+        self.indices, self.ranks = merged.indices, merged.ranks
+        return self
+
+    def merge(self, *others: "HyperLogLog") -> "HyperLogLog":
+        """Return a new sketch holding the union of this sketch and the others."""
+        for other in others:
+            if other.precision != self.precision:
+                raise ValueError("Cannot merge HyperLogLog sketches with different precision.")
+        indices = np.concatenate([self.indices] + [o.indices for o in others]).astype(np.int64)
+        ranks = np.concatenate([self.ranks] + [o.ranks for o in others])
+        if len(indices) == 0:
+            return HyperLogLog(self.precision)
+        order = np.lexsort((ranks, indices))
+        indices, ranks = indices[order], ranks[order]
+        last = np.append(_group_boundaries(indices)[1:], len(indices)) - 1
+        return HyperLogLog(self.precision, indices[last], ranks[last])
+
+    def estimate(self) -> int:
+        """Return the approximate number of distinct values added."""
+        m = 1 << self.precision
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+        zeros = m - len(self.indices)
+        raw = alpha * m * m / (np.sum(np.ldexp(1.0, -self.ranks.astype(np.int64))) + zeros)
+        if raw <= 2.5 * m and zeros > 0:
+            # Linear counting is more accurate for small cardinalities
+            return int(round(m * math.log(m / zeros)))
+        return int(round(raw))
+
+    def to_string(self) -> str:
+        """Serialize the sketch to a compact string."""
+        payload = self.indices.astype("<u2").tobytes() + self.ranks.tobytes()
+        return f"hll:{self.precision}:{base64.b64encode(payload).decode('ascii')}"
+
+    @classmethod
+    def from_string(cls, text: str) -> "HyperLogLog":
+        """Read a sketch written by to_string()."""
+        kind, precision, payload = text.split(":", 2)
+        if kind != "hll":
+            raise ValueError(f"Not a HyperLogLog sketch: '{text[:20]}'")
+        raw = base64.b64decode(payload)
+        k = len(raw) // 3
+        indices = np.frombuffer(raw[:2 * k], dtype="<u2")
+        ranks = np.frombuffer(raw[2 * k:], dtype=np.uint8)
+        return cls(int(precision), indices, ranks)
+
+    def __str__(self) -> str:
+        return self.to_string()
+
+    def __repr__(self) -> str:
+        return f"HyperLogLog(precision={self.precision}, estimate={self.estimate()})"
+
+
+# Added to DDSketch bucket keys so that values below 1 still get a positive key
+_KEY_OFFSET = 1 << 20
+
+
+class DDSketch:
+    """Sparse DDSketch for approximate quantiles with bounded relative error."""
+
+    def __init__(self, relative_accuracy: float = 0.01, keys: Optional[np.ndarray] = None,
+                 counts: Optional[np.ndarray] = None, zero_count: int = 0):
+        """
+        Initialize an empty sketch, or one with the given buckets.
+
+        Parameters:
+            relative_accuracy (float): Maximum relative error of any returned quantile.
+            keys (np.ndarray, optional): Sorted signed bucket keys; negative values use negated keys.
+            counts (np.ndarray, optional): Number of values in each bucket.
+            zero_count (int): Number of values equal to zero.
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f"DDSketch relative_accuracy must be between 0 and 1, got {relative_accuracy}.")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        # Bucket keys are offset by _KEY_OFFSET so the sign of a key gives the sign of its values
+        self.keys = np.empty(0, dtype=np.int32) if keys is None else keys.astype(np.int32, copy=False)
+        self.counts = np.empty(0, dtype=np.int64) if counts is None else counts.astype(np.int64, copy=False)
+        self.zero_count = int(zero_count)
+
+    def _bucket_keys(self, values: np.ndarray) -> np.ndarray:
+        """Map non-zero values to signed bucket keys."""
+        magnitude = np.ceil(np.log(np.abs(values)) / np.log(self.gamma)).astype(np.int64) + _KEY_OFFSET
+        return np.where(values > 0, magnitude, -magnitude).astype(np.int32)
+
+    @classmethod
+    def packed_from_values(cls, values: np.ndarray, group_ids: np.ndarray, n_groups: int,
+                           relative_accuracy: float = 0.01) -> Tuple[np.ndarray, ...]:
+        """
+        Build packed sketches, one per group, from row values and group ids (-1 rows and NaN are skipped).
+
+        Returns:
+            tuple: (lengths, keys, counts, zero_counts), the buckets of all groups back to back.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        keep = (group_ids >= 0) & ~np.isnan(values)
+        values, group_ids = values[keep], group_ids[keep].astype(np.int64)
+        template = cls(relative_accuracy)
+
+        zero = values == 0
+        zero_counts = np.bincount(group_ids[zero], minlength=n_groups)
+        values, group_ids = values[~zero], group_ids[~zero]
+        keys = template._bucket_keys(values).astype(np.int64)
+
+        # Count rows per (group, bucket)
+        order = np.lexsort((keys, group_ids))
+        group_ids, keys = group_ids[order], keys[order]
+        starts = _group_boundaries((group_ids << 32) + keys)
+        counts = np.diff(np.append(starts, len(keys)))
+        group_ids, keys = group_ids[starts], keys[starts]
+        return np.bincount(group_ids, minlength=n_groups), keys, counts, zero_counts
+
+    @classmethod
+    def from_packed(cls, lengths: np.ndarray, keys: np.ndarray, counts: np.ndarray, zero_counts: np.ndarray,
+                    relative_accuracy: float = 0.01) -> List["DDSketch"]:
+        """Build one sketch per group from packed buckets."""
+        bounds = np.cumsum(lengths)[:-1]
+        return [cls(relative_accuracy, k, c, z)
+                for k, c, z in zip(np.split(keys, bounds), np.split(counts, bounds), zero_counts)]
+
+    @classmethod
+    def from_values(cls, values: np.ndarray, group_ids: np.ndarray, n_groups: int,
+                    relative_accuracy: float = 0.01) -> List["DDSketch"]:
+        """Build one sketch per group from row values and group ids (-1 rows and NaN are skipped)."""
+        return cls.from_packed(*cls.packed_from_values(values, group_ids, n_groups, relative_accuracy),
+                               relative_accuracy)
+
+    def add(self, values) -> "DDSketch":
+        """Add values to the sketch in place and return it."""
+        values = pd.Series(values, dtype="float64").dropna().to_numpy()
+        (added,) = self.from_values(values, np.zeros(len(values), dtype=np.int64), 1, self.relative_accuracy)
+        merged = self.merge(added)
+        self.keys, self.counts, self.zero_count = merged.keys, merged.counts, merged.zero_count
+        return self
+
+    def merge(self, *others: "DDSketch") -> "DDSketch":
+        """Return a new sketch holding the values of this sketch and the others."""
+        for other in others:
+            if other.relative_accuracy != self.relative_accuracy:
+                raise ValueError("Cannot merge DDSketch sketches with different relative accuracy.")
+        keys = np.concatenate([self.keys] + [o.keys for o in others])
+        counts = np.concatenate([self.counts] + [o.counts for o in others])
+        zero_count = self.zero_count + sum(o.zero_count for o in others)
+        unique, inverse = np.unique(keys, return_inverse=True)
+        return DDSketch(self.relative_accuracy, unique, np.bincount(inverse, weights=counts, minlength=len(unique)),
+                        zero_count)
+
+    @property
+    def count(self) -> int:
+        """Number of values added."""
+        return int(self.counts.sum()) + self.zero_count
+
+    def quantile(self, q: float) -> float:
+        """Return the approximate q-quantile (0 <= q <= 1), or NaN if the sketch is empty."""
+        if not 0 <= q <= 1:
+            raise ValueError(f"Quantile must be between 0 and 1, got {q}.")
+        total = self.count
+        if total == 0:
+            return float("nan")
+        rank = q * (total - 1)
+
+        # Sorted negative keys run from the most negative value upwards
+        negative = self.keys < 0
+        neg_keys, neg_counts = -self.keys[negative], self.counts[negative]
+        pos_keys, pos_counts = self.keys[~negative], self.counts[~negative]
+
+        seen = np.cumsum(neg_counts)
+        if len(seen) and rank < seen[-1]:
+            i = int(np.searchsorted(seen, rank, side="right"))
+            return -self._bucket_value(neg_keys[i])
+        offset = seen[-1] if len(seen) else 0
+        if rank < offset + self.zero_count:
+            return 0.0
+        seen = np.cumsum(pos_counts) + offset + self.zero_count
+        i = min(int(np.searchsorted(seen, rank, side="right")), len(seen) - 1)
+        return self._bucket_value(pos_keys[i])
+
+    def _bucket_value(self, key: int) -> float:
+        """Representative value of a positive bucket key."""
+        return 2 * self.gamma ** (int(key) - _KEY_OFFSET) / (self.gamma + 1)
+
+    def to_string(self) -> str:
+        """Serialize the sketch to a compact string."""
+        payload = self.keys.astype("<i4").tobytes() + self.counts.astype("<i8").tobytes()
+        return f"dds:{self.relative_accuracy!r}:{self.zero_count}:{base64.b64encode(payload).decode('ascii')}"
+
+    @classmethod
+    def from_string(cls, text: str) -> "DDSketch":
+        """Read a sketch written by to_string()."""
+        kind, accuracy, zero_count, payload = text.split(":", 3)
+        if kind != "dds":
+            raise ValueError(f"Not a DDSketch sketch: '{text[:20]}'")
+        raw = base64.b64decode(payload)
+        k = len(raw) // 12
+        keys = np.frombuffer(raw[:4 * k], dtype="<i4")
+        counts = np.frombuffer(raw[4 * k:], dtype="<i8")
+        return cls(float(accuracy), keys, counts, int(zero_count))
+
+    def __str__(self) -> str:
+        return self.to_string()
+
+    def __repr__(self) -> str:
+        return f"DDSketch(relative_accuracy={self.relative_accuracy}, count={self.count})"
+
+
+# Reducer name in a metrics dict -> sketch class
+SKETCH_REDUCERS = {"hll": HyperLogLog, "ddsketch": DDSketch}
+
+
+def is_sketch_reducer(func) -> bool:
+    """Return True if a metrics reducer name refers to a sketch."""
+    return isinstance(func, str) and func in SKETCH_REDUCERS
+
+
+def split_sketch_metrics(metrics: dict):
+    """Split a metrics dict into pandas reducers and a list of (column, sketch reducer) pairs."""
+    pandas_metrics, sketches = {}, []
+    for col, aggs in metrics.items():
+        funcs = aggs if isinstance(aggs, list) else [aggs]
+        for func in funcs:
+            if is_sketch_reducer(func):
+                sketches.append((col, func))
+            else:
+                pandas_metrics.setdefault(col, []).append(func)
+    # Keep single reducers as plain strings so column naming matches the original dict
+    pandas_metrics = {col: (funcs if isinstance(metrics[col], list) else funcs[0])
+                      for col, funcs in pandas_metrics.items()}
+    return pandas_metrics, sketches
+
+
+def build_sketch_column(func: str, values: pd.Series, group_ids: np.ndarray, n_groups: int) -> list:
+    """Build one sketch per group for a sketch reducer."""
+    group_ids = np.asarray(group_ids, dtype=np.int64)
+    if func == "hll":
+        valid = values.notna().to_numpy()
+        return HyperLogLog.from_hashes(hash_values(values.to_numpy()), np.where(valid, group_ids, -1), n_groups)
+    if func == "ddsketch":
+        return DDSketch.from_values(values.to_numpy(dtype=np.float64, na_value=np.nan), group_ids, n_groups)
+    raise ValueError(f"Unknown sketch reducer '{func}'.")
+
+
+def concat_packed(packed: List[tuple]) -> tuple:
+    """Join packed sketches of the same kind, keeping group order."""
+    return tuple(np.concatenate(arrays) for arrays in zip(*packed))
+
+
+def unpack_sketches(func: str, packed: tuple) -> list:
+    """Build the sketch objects for a sketch reducer from its packed form."""
+    if func not in SKETCH_REDUCERS:
+        raise ValueError(f"Unknown sketch reducer '{func}'.")
+    return SKETCH_REDUCERS[func].from_packed(*packed)
+
+
+def merge_sketches(sketches: Iterable):
+    """Merge an iterable of sketches of the same kind into one."""
+    sketches = list(sketches)
+    if not sketches:
+        raise ValueError("No sketches to merge.")
+    return sketches[0].merge(*sketches[1:])
+
+
+def sketch_from_string(text: str):
+    """Read a sketch written to CSV back into a HyperLogLog or DDSketch."""
+    kind = text.split(":", 1)[0]
+    if kind == "hll":
+        return HyperLogLog.from_string(text)
+    if kind == "dds":
+        return DDSketch.from_string(text)
+    raise ValueError(f"Unknown sketch string: '{text[:20]}'")
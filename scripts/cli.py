@@ -0,0 +1,141 @@
+r"""
+scripts/cli.py
+
+One command-line entry point for the pipeline stages:
+
+- prep:     clean raw CSV files into data/prepared (scripts.data_prep)
+- etl:      load prepared files into the data warehouse (scripts.etl_to_dw)
+- cube:     build the OLAP cubes (olap.script)
+- features: update rolling-window sales features (olap.rolling_features)
+
+Only the module for the chosen stage is imported, and only when it runs, so
+`--help` and short incremental runs do not pay for pandas or other stages.
+
+Add --import-time before the stage name to report how long the stage's
+imports take instead of running it. Use it to track startup regressions.
+
+Install the project once in editable mode (py -m pip install -e .) to get the
+smart-sales command, which runs from any folder:
+
+smart-sales prep
+smart-sales cube
+smart-sales --import-time etl
+
+Without installing, open a terminal in the root project folder and run
+py -m scripts.cli prep (or python3 -m scripts.cli prep) instead.
+"""
+
+import argparse
+import importlib
+import pathlib
+import subprocess
+import sys
+from typing import List, Optional, Tuple
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+# Stage name to (module, function, help text). Modules are imported only when their stage runs.
+COMMANDS = {
+    "prep": ("scripts.data_prep", "main", "Clean raw CSV files into data/prepared."),
+    "etl": ("scripts.etl_to_dw", "load_data_to_db", "Load prepared files into the data warehouse."),
+    "cube": ("olap.script", "main", "Build the OLAP cubes from the data warehouse."),
+    "features": ("olap.rolling_features", "main", "Update rolling-window sales features."),
+}
+
+# Number of slowest imports listed by --import-time
+IMPORT_TIME_TOP = 15
+
+
+def run_command(name: str) -> None:
+    """Import the module for a stage and run its entry function."""
+    module_name, function_name, _ = COMMANDS[name]
+    if str(PROJECT_ROOT) not in sys.path:
+        sys.path.insert(0, str(PROJECT_ROOT))
+    module = importlib.import_module(module_name)
+    getattr(module, function_name)()
+
+
+def parse_import_times(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """
+    Parse `python -X importtime` output.
+
+    Returns:
+        list: (module, depth, self microseconds, cumulative microseconds) for each import,
+              in output order. Depth 0 is the module that was imported itself.
+    """
+    times = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # The header line
+        # Nested imports are indented two spaces per level after the separator's space
+        name = fields[2][1:]
+        depth = (len(name) - len(name.lstrip())) // 2
+        times.append((name.strip(), depth, int(fields[0]), int(fields[1])))
+    return times
+
+
+def measure_import_times(code: str) -> List[Tuple[str, int, int, int]]:
+    """
+    Run code in a fresh interpreter from the project root under `python -X importtime`.
+
+    Raises:
+        RuntimeError: If the code fails.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            cwd=PROJECT_ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Running '{code}' failed:\n{result.stderr.strip()}")
+    return parse_import_times(result.stderr)
+
+
+def import_time_report(name: str, top: int = IMPORT_TIME_TOP) -> str:
+    """
+    Import a stage's module in a fresh interpreter and report where its import time goes.
+
+    Modules the interpreter imports at startup (site, encodings, ...) are measured with an
+    empty run and left out, so the total covers only the stage's own imports.
+
+    Raises:
+        RuntimeError: If the module cannot be imported.
+    """
+    module_name = COMMANDS[name][0]
+    startup = {module for module, _, _, _ in measure_import_times("pass")}
+    times = [t for t in measure_import_times(f"import {module_name}") if t[0] not in startup]
+
+    # Top-level imports add up to the whole import
+    total = sum(cumulative for _, depth, _, cumulative in times if depth == 0)
+    lines = [f"Import time for '{name}' ({module_name}): {total / 1000:.1f} ms, "
+             f"not counting interpreter startup",
+             f"{'cumulative ms':>14}  {'self ms':>8}  module"]
+    slowest = sorted(times, key=lambda t: t[3], reverse=True)[:top]
+    for module, _, self_us, cumulative_us in slowest:
+        lines.append(f"{cumulative_us / 1000:>14.1f}  {self_us / 1000:>8.1f}  {module}")
+    return "\n".join(lines)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="smart-sales",
+                                     description="Run a smart sales pipeline stage.")
+    parser.add_argument("--import-time", action="store_true",
+                        help="Report the stage's import time instead of running it.")
+    subparsers = parser.add_subparsers(dest="command", required=True, metavar="command")
+    for name, (_, _, help_text) in COMMANDS.items():
+        subparsers.add_parser(name, help=help_text)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Parse arguments and run the chosen stage, or report its import time."""
+    args = build_parser().parse_args(argv)
+    if args.import_time:
+        print(import_time_report(args.command))
+        return 0
+    run_command(args.command)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
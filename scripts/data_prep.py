@@ -27,6 +27,7 @@ ruff will ignore the warning on just that line.
 
 import pathlib
 import sys
+from typing import Optional
 import pandas as pd
 
 # For local imports, temporarily add project root to Python sys.path
@@ -35,27 +36,76 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.append(str(PROJECT_ROOT))
 
 # Now we can import local modules
-from utils.logger import logger  # noqa: E402
+from utils.logger import init_logger, logger  # noqa: E402
 from scripts.data_scrubber import DataScrubber  # noqa: E402
+from scripts.raw_ingest import IngestLedger, read_csv_files, resolve_raw_sources  # noqa: E402
 
 # Constants
 DATA_DIR: pathlib.Path = PROJECT_ROOT.joinpath("data")
 RAW_DATA_DIR: pathlib.Path = DATA_DIR.joinpath("raw")
 PREPARED_DATA_DIR: pathlib.Path = DATA_DIR.joinpath("prepared")
 
-def read_raw_data(file_name: str) -> pd.DataFrame:
-    """Read raw data from CSV."""
-    file_path: pathlib.Path = RAW_DATA_DIR.joinpath(file_name)
-    return pd.read_csv(file_path)
-
-def save_prepared_data(df: pd.DataFrame, file_name: str) -> None:
-    """Save cleaned data to CSV."""
+# Validation rules for DataScrubber.apply_validation_rules() (pandas checks them rule by rule)
+CUSTOMER_RULES = [{"rule": "not_null", "columns": ["CustomerID", "Name"]}]  # Critical info
+SALES_RULES = [{"rule": "not_null", "columns": ["TransactionID", "SaleDate"]}]  # Key information
+
+# Sales arrive as one file or as many per-store/per-day drops (sales_data_<store>_<day>.csv)
+SALES_RAW_SOURCE: str = "sales_data*.csv"
+SALES_INGEST_LEDGER: pathlib.Path = RAW_DATA_DIR.joinpath(".sales_ingested.json")
+
+def read_raw_data(source: str, ledger: Optional[IngestLedger] = None) -> pd.DataFrame:
+    """
+    Read raw data from a CSV file name, glob pattern, or manifest, reading files concurrently.
+
+    With a ledger, only files not yet ingested are read. If an ingested file changed or was
+    removed, the ledger is reset and all files are read, so the prepared file is rebuilt
+    instead of getting the changed file's rows a second time.
+    """
+    paths = resolve_raw_sources(source, RAW_DATA_DIR)
+    if ledger is not None:
+        changed = ledger.changed_files(paths)
+        if changed:
+            logger.warning(f"{len(changed)} ingested file(s) changed or were removed "
+                           f"({', '.join(changed[:5])}); re-reading all files for {source}")
+            ledger.reset()
+    df = read_csv_files(paths, ledger=ledger)
+    logger.info(f"Read {len(df)} rows from {source} ({len(paths)} file(s) matched)")
+    return df
+
+def save_prepared_data(df: pd.DataFrame, file_name: str, append: bool = False,
+                       unique_key: Optional[str] = None) -> None:
+    """
+    Save cleaned data to CSV, or append it to an existing prepared file.
+
+    Appended rows are written in the column order of the existing file's header.
+    With a unique_key, appended rows whose key is already in the file (a re-sent
+    drop under a new file name, for example) are dropped and counted in the log.
+
+    Raises:
+        ValueError: If appending and the columns differ from the existing file's header.
+    """
     file_path: pathlib.Path = PREPARED_DATA_DIR.joinpath(file_name)
+    if append and file_path.exists():
+        header = pd.read_csv(file_path, nrows=0).columns.tolist()
+        if sorted(header) != sorted(df.columns):
+            raise ValueError(f"Cannot append to {file_path}: columns {sorted(df.columns)} "
+                             f"do not match the file's header {header}.")
+        if unique_key is not None:
+            existing = pd.read_csv(file_path, usecols=[unique_key])[unique_key]
+            already_saved = df[unique_key].isin(existing).to_numpy()
+            if already_saved.any():
+                logger.warning(f"Dropped {int(already_saved.sum())} rows whose {unique_key} "
+                               f"is already in {file_path}")
+                df = df[~already_saved]
+        df[header].to_csv(file_path, index=False, mode="a", header=False)
+        logger.info(f"Data appended to {file_path}")
+        return
     df.to_csv(file_path, index=False)
     logger.info(f"Data saved to {file_path}")
 
 def main() -> None:
     """Main function for pre-processing customer, product, and sales data."""
+    init_logger()
     logger.info("======================")
     logger.info("STARTING data_prep.py")
     logger.info("======================")
@@ -70,9 +120,10 @@ def main() -> None:
     df_customers = df_customers.drop_duplicates()            # Remove duplicates
 
     df_customers['Name'] = df_customers['Name'].str.strip()  # Trim whitespace from column values
-    df_customers = df_customers.dropna(subset=['CustomerID', 'Name'])  # Drop rows missing critical info
     
     scrubber_customers = DataScrubber(df_customers)
+    validation = scrubber_customers.apply_validation_rules(CUSTOMER_RULES, policy="drop")  # Drop rows missing critical info
+    logger.info(validation.summary())
     scrubber_customers.check_data_consistency_before_cleaning()
     scrubber_customers.inspect_data()
     
@@ -104,22 +155,30 @@ def main() -> None:
     logger.info("Starting SALES prep")
     logger.info("========================")
 
-    df_sales = read_raw_data("sales_data.csv")
+    sales_ledger = IngestLedger(SALES_INGEST_LEDGER)
+    df_sales = read_raw_data(SALES_RAW_SOURCE, ledger=sales_ledger)
 
-    df_sales.columns = df_sales.columns.str.strip()  # Clean column names
-    df_sales = df_sales.drop_duplicates()            # Remove duplicates
+    if df_sales.empty:
+        logger.info("No new sales files to ingest; prepared sales data left unchanged.")
+    else:
+        df_sales.columns = df_sales.columns.str.strip()  # Clean column names
+        df_sales = df_sales.drop_duplicates()            # Remove duplicates
 
-    df_sales['SaleDate'] = pd.to_datetime(df_sales['SaleDate'], errors='coerce')  # Ensure sale_date is datetime
-    df_sales = df_sales.dropna(subset=['TransactionID', 'SaleDate'])  # Drop rows missing key information
+        df_sales['SaleDate'] = pd.to_datetime(df_sales['SaleDate'], errors='coerce')  # Ensure sale_date is datetime
     
-    scrubber_sales = DataScrubber(df_sales)
-    scrubber_sales.check_data_consistency_before_cleaning()
-    scrubber_sales.inspect_data()
+        scrubber_sales = DataScrubber(df_sales)
+        validation = scrubber_sales.apply_validation_rules(SALES_RULES, policy="drop")  # Drop rows missing key information
+        logger.info(validation.summary())
+        scrubber_sales.check_data_consistency_before_cleaning()
+        scrubber_sales.inspect_data()
     
-    df_sales = scrubber_sales.handle_missing_data(fill_value="Unknown")
-    scrubber_sales.check_data_consistency_after_cleaning()
+        df_sales = scrubber_sales.handle_missing_data(fill_value="Unknown")
+        scrubber_sales.check_data_consistency_after_cleaning()
 
-    save_prepared_data(df_sales, "sales_data_prepared.csv")
+        # Later runs only read new drops, so their rows are appended to the prepared file
+        save_prepared_data(df_sales, "sales_data_prepared.csv", append=len(sales_ledger) > 0,
+                           unique_key="TransactionID")
+        sales_ledger.commit()
 
     logger.info("======================")
     logger.info("FINISHED data_prep.py")
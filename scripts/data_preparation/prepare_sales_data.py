@@ -1,19 +1,39 @@
+import pathlib
+import sys
+
 import pandas as pd
 
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from scripts.data_scrubber import DataScrubber  # noqa: E402
+
+# Rows missing any of these are dropped
+CRITICAL_FIELDS = ['TransactionID', 'CustomerID', 'ProductID', 'SaleAmount']
+
 def clean_sales_data(input_path, output_path):
     df = pd.read_csv(input_path)
 
     # Remove duplicates
     df.drop_duplicates(inplace=True)
 
-    # Drop rows with missing critical fields
-    df.dropna(subset=['TransactionID', 'CustomerID', 'ProductID', 'SaleAmount'], inplace=True)
+    scrubber = DataScrubber(df)
+    critical = {"rule": "not_null", "columns": CRITICAL_FIELDS}
 
-    # Remove outliers in SaleAmount
-    Q1 = df['SaleAmount'].quantile(0.25)
-    Q3 = df['SaleAmount'].quantile(0.75)
+    # Outlier bounds for SaleAmount (1.5 * IQR) come from the rows with all critical fields
+    complete = scrubber.apply_validation_rules([critical]).valid_mask
+    Q1 = scrubber.df.loc[complete, 'SaleAmount'].quantile(0.25)
+    Q3 = scrubber.df.loc[complete, 'SaleAmount'].quantile(0.75)
     IQR = Q3 - Q1
-    df = df[(df['SaleAmount'] >= (Q1 - 1.5 * IQR)) & (df['SaleAmount'] <= (Q3 + 1.5 * IQR))]
+    outliers = {"rule": "range", "column": "SaleAmount", "min": Q1 - 1.5 * IQR, "max": Q3 + 1.5 * IQR,
+                "name": "sale_amount_iqr"}
+
+    # Drop rows with missing critical fields or an outlier SaleAmount
+    result = scrubber.apply_validation_rules([critical, outliers], policy="drop")
+    print(result.summary())
+    df = scrubber.df
 
     # Ensure correct data types
     df['TransactionID'] = df['TransactionID'].astype(int)
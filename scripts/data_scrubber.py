@@ -12,21 +12,99 @@ re-usable cleaning and preparation methods.
 
 See the associated test script in the tests folder. 
 
+By default the methods run on pandas. Pass backend="polars" to run the same 
+method calls on Polars, a multi-threaded columnar engine. Methods still return 
+pandas DataFrames, so existing scripts do not change; use the `frame` attribute 
+to work with the native Polars frame directly.
+
+One difference: Polars frames have no row labels. After a method removes rows 
+(filter_column_outliers, handle_missing_data with drop=True, 
+remove_duplicate_records, or apply_validation_rules with 'drop'/'quarantine'), 
+the pandas backend keeps the original index labels, while the Polars backend 
+returns a fresh 0..n-1 RangeIndex. Use positions or call reset_index(drop=True) 
+if code must work with both.
+
 """
 
-import io
 import pandas as pd
 from typing import Dict, Tuple, Union, List
 
+from scripts.scrubber_backends import get_backend
+from scripts.validation_rules import VALIDATION_POLICIES, ValidationResult, compile_rules
+
 class DataScrubber:
-    def __init__(self, df: pd.DataFrame):
+    def __init__(self, df: pd.DataFrame, backend: str = "pandas"):
         """
         Initialize the DataScrubber with a DataFrame.
         
         Parameters:
-            df (pd.DataFrame): The DataFrame to be scrubbed.
+            df (pd.DataFrame): The DataFrame to be scrubbed (or a native frame of the chosen backend).
+            backend (str, optional): Engine used by the methods, "pandas" (default) or "polars".
+        """
+        self.backend = get_backend(backend)
+        self.frame = df if self.backend.is_native(df) else self.backend.from_pandas(df)
+
+    @property
+    def frame(self):
+        """The DataFrame being scrubbed, in the backend's native type."""
+        return self._frame
+
+    @frame.setter
+    def frame(self, frame) -> None:
+        self._frame = frame
+        self._pandas_df = None
+
+    @property
+    def df(self) -> pd.DataFrame:
+        """The DataFrame being scrubbed, as pandas (converted once per change for other backends)."""
+        if self._pandas_df is None:
+            self._pandas_df = self.backend.to_pandas(self._frame)
+        return self._pandas_df
+
+    @df.setter
+    def df(self, df: pd.DataFrame) -> None:
+        self.frame = self.backend.from_pandas(df)
+
+    def _check_column(self, column: str) -> None:
+        """Raise ValueError if a column is not in the DataFrame."""
+        if column not in self.backend.columns(self.frame):
+            raise ValueError(f"Column name '{column}' not found in the DataFrame.")
+
+    def apply_validation_rules(self, rules: List[Dict], policy: str = "report") -> ValidationResult:
+        """
+        Validate every row against declarative rules and collect the results in one matrix.
+        
+        Parameters:
+            rules (list): Rule dictionaries (see scripts/validation_rules.py), e.g.
+                          {"rule": "range", "column": "DiscountPercent", "min": 0, "max": 100}.
+            policy (str, optional): What to do with rows that break a rule:
+                                    'report' (default) keeps them, 'drop' removes them,
+                                    'quarantine' removes them and keeps them on the result,
+                                    'fail' raises an error if there are any.
+        
+        Returns:
+            ValidationResult: Per-rule violation counts and row masks.
+
+        Raises:
+            ValueError: If the policy or a rule is invalid, a rule column is not found,
+                        or the policy is 'fail' and a rule is broken.
         """
-        self.df = df
+        if policy not in VALIDATION_POLICIES:
+            raise ValueError(f"Unknown validation policy '{policy}'. Choose one of: {', '.join(VALIDATION_POLICIES)}.")
+        compiled = compile_rules(rules)
+        for rule in compiled:
+            for column in rule.columns:
+                self._check_column(column)
+
+        result = ValidationResult(compiled, self.backend.evaluate_rules(self.frame, compiled), policy)
+        if result.invalid_count:
+            if policy == "fail":
+                raise ValueError(result.summary())
+            if policy == "quarantine":
+                result.quarantine = self.backend.to_pandas(self.backend.filter_rows(self.frame, ~result.valid_mask))
+            if policy in ("drop", "quarantine"):
+                self.frame = self.backend.filter_rows(self.frame, result.valid_mask)
+        return result
 
     def check_data_consistency_before_cleaning(self) -> Dict[str, Union[pd.Series, int]]:
         """
@@ -35,8 +113,8 @@ class DataScrubber:
         Returns:
             dict: Dictionary with counts of null values and duplicate rows.
         """
-        null_counts = self.df.isnull().sum()
-        duplicate_count = self.df.duplicated().sum()
+        null_counts = self.backend.null_counts(self.frame)
+        duplicate_count = self.backend.duplicate_count(self.frame)
         return {'null_counts': null_counts, 'duplicate_count': duplicate_count}
 
     def check_data_consistency_after_cleaning(self) -> Dict[str, Union[pd.Series, int]]:
@@ -45,11 +123,17 @@ class DataScrubber:
         
         Returns:
             dict: Dictionary with counts of null values and duplicate rows, expected to be zero for each.
+
+        Raises:
+            ValueError: If the data still contains null values or duplicate rows.
         """
-        null_counts = self.df.isnull().sum()
-        duplicate_count = self.df.duplicated().sum()
-        assert null_counts.sum() == 0, "Data still contains null values after cleaning."
-        assert duplicate_count == 0, "Data still contains duplicate records after cleaning."
+        rules = [
+            {"rule": "not_null", "columns": self.backend.columns(self.frame), "name": "no null values"},
+            {"rule": "unique", "name": "no duplicate records"},
+        ]
+        self.apply_validation_rules(rules, policy="fail")
+        null_counts = self.backend.null_counts(self.frame)
+        duplicate_count = self.backend.duplicate_count(self.frame)
         return {'null_counts': null_counts, 'duplicate_count': duplicate_count}
 
     def convert_column_to_new_data_type(self, column: str, new_type: type) -> pd.DataFrame:
@@ -66,11 +150,9 @@ class DataScrubber:
         Raises:
             ValueError: If the specified column not found in the DataFrame.
         """
-        try:
-            self.df[column] = self.df[column].astype(new_type)
-            return self.df
-        except KeyError:
-            raise ValueError(f"Column name '{column}' not found in the DataFrame.")
+        self._check_column(column)
+        self.frame = self.backend.cast(self.frame, column, new_type)
+        return self.df
 
     def drop_columns(self, columns: List[str]) -> pd.DataFrame:
         """
@@ -86,9 +168,8 @@ class DataScrubber:
             ValueError: If a specified column is not found in the DataFrame.
         """
         for column in columns:
-            if column not in self.df.columns:
-                raise ValueError(f"Column name '{column}' not found in the DataFrame.")
-        self.df = self.df.drop(columns=columns)
+            self._check_column(column)
+        self.frame = self.backend.drop_columns(self.frame, columns)
         return self.df
 
     def filter_column_outliers(self, column: str, lower_bound: Union[float, int], upper_bound: Union[float, int]) -> pd.DataFrame:
@@ -106,11 +187,9 @@ class DataScrubber:
         Raises:
             ValueError: If the specified column not found in the DataFrame.
         """
-        try:
-            self.df = self.df[(self.df[column] >= lower_bound) & (self.df[column] <= upper_bound)]
-            return self.df
-        except KeyError:
-            raise ValueError(f"Column name '{column}' not found in the DataFrame.")
+        self._check_column(column)
+        self.frame = self.backend.filter_between(self.frame, column, lower_bound, upper_bound)
+        return self.df
 
     def format_column_strings_to_lower_and_trim(self, column: str) -> pd.DataFrame:
         """
@@ -125,11 +204,9 @@ class DataScrubber:
         Raises:
             ValueError: If the specified column not found in the DataFrame.
         """
-        try:
-            self.df[column] = self.df[column].str.lower().str.strip()
-            return self.df
-        except KeyError:
-            raise ValueError(f"Column name '{column}' not found in the DataFrame.")
+        self._check_column(column)
+        self.frame = self.backend.lower_and_trim(self.frame, column)
+        return self.df
         
     def format_column_strings_to_upper_and_trim(self, column: str) -> pd.DataFrame:
         """
@@ -144,13 +221,9 @@ class DataScrubber:
         Raises:
             ValueError: If the specified column not found in the DataFrame.
         """
-        try:
-            # TODO: Fix the following logic to call str.upper() and str.strip() on the given column 
-            # HINT: See previous function for an example
-            self.df[column] = self.df[column].str.upper().str.strip()
-            return self.df
-        except KeyError:
-            raise ValueError(f"Column name '{column}' not found in the DataFrame.")
+        self._check_column(column)
+        self.frame = self.backend.upper_and_trim(self.frame, column)
+        return self.df
 
     def handle_missing_data(self, drop: bool = False, fill_value: Union[None, float, int, str] = None) -> pd.DataFrame:
         """
@@ -164,9 +237,9 @@ class DataScrubber:
             pd.DataFrame: Updated DataFrame with missing data handled.
         """
         if drop:
-            self.df = self.df.dropna()
+            self.frame = self.backend.drop_missing(self.frame)
         elif fill_value is not None:
-            self.df = self.df.fillna(fill_value)
+            self.frame = self.backend.fill_missing(self.frame, fill_value)
         return self.df
 
     def inspect_data(self) -> Tuple[str, str]:
@@ -177,12 +250,7 @@ class DataScrubber:
             tuple: (info_str, describe_str), where `info_str` is a string representation of DataFrame.info()
                    and `describe_str` is a string representation of DataFrame.describe().
         """
-        buffer = io.StringIO()
-        self.df.info(buf=buffer)
-        info_str = buffer.getvalue()  # Retrieve the string content of the buffer
-
-        # Capture the describe output as a string
-        describe_str = self.df.describe().to_string()  # Convert DataFrame.describe() output to a string
+        info_str, describe_str = self.backend.inspect(self.frame)
         return info_str, describe_str
 
     def parse_dates_to_add_standard_datetime(self, column: str) -> pd.DataFrame:
@@ -198,11 +266,9 @@ class DataScrubber:
         Raises:
             ValueError: If the specified column not found in the DataFrame.
         """
-        try:
-            self.df['StandardDateTime'] = pd.to_datetime(self.df[column])
-            return self.df
-        except KeyError:
-            raise ValueError(f"Column name '{column}' not found in the DataFrame.")
+        self._check_column(column)
+        self.frame = self.backend.parse_dates(self.frame, column, 'StandardDateTime')
+        return self.df
 
     def remove_duplicate_records(self) -> pd.DataFrame:
         """
@@ -212,7 +278,7 @@ class DataScrubber:
             pd.DataFrame: Updated DataFrame with duplicates removed.
 
         """
-        self.df = self.df.drop_duplicates()
+        self.frame = self.backend.drop_duplicates(self.frame)
         return self.df
 
     def rename_columns(self, column_mapping: Dict[str, str]) -> pd.DataFrame:
@@ -230,10 +296,10 @@ class DataScrubber:
         """
 
         for old_name, new_name in column_mapping.items():
-            if old_name not in self.df.columns:
+            if old_name not in self.backend.columns(self.frame):
                 raise ValueError(f"Column '{old_name}' not found in the DataFrame.")
 
-        self.df = self.df.rename(columns=column_mapping)
+        self.frame = self.backend.rename(self.frame, column_mapping)
         return self.df
 
     def reorder_columns(self, columns: List[str]) -> pd.DataFrame:
@@ -250,7 +316,6 @@ class DataScrubber:
             ValueError: If a specified column is not found in the DataFrame.
         """
         for column in columns:
-            if column not in self.df.columns:
-                raise ValueError(f"Column name '{column}' not found in the DataFrame.")
-        self.df = self.df[columns]
+            self._check_column(column)
+        self.frame = self.backend.select(self.frame, columns)
         return self.df
\ No newline at end of file
@@ -9,9 +9,9 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.append(str(PROJECT_ROOT))
 
 # Constants
-DW_DIR = pathlib.Path("data").joinpath("dw")
+DW_DIR = PROJECT_ROOT.joinpath("data", "dw")
 DB_PATH = DW_DIR.joinpath("smart_sales.db")
-PREPARED_DATA_DIR = pathlib.Path("data").joinpath("prepared")
+PREPARED_DATA_DIR = PROJECT_ROOT.joinpath("data", "prepared")
 
 def create_schema(cursor: sqlite3.Cursor) -> None:
     """Create tables in the data warehouse if they don't exist."""
@@ -0,0 +1,184 @@
+r"""
+scripts/raw_ingest.py
+
+Do not run this script directly.
+Instead, from this module (scripts.raw_ingest) import the reading helpers.
+
+Helpers for reading raw data that arrives as many small files, such as
+per-store, per-day sales drops.
+
+- resolve_raw_sources() turns a file name, a glob pattern such as
+  "sales_*.csv", or a manifest file (*.manifest or *.txt, one path per
+  line) into an ordered list of files.
+- read_csv_files() reads those files concurrently in a thread pool,
+  keeps at most `max_in_flight` reads outstanding so memory stays bounded,
+  and concatenates the results in the order of the list.
+- IngestLedger remembers which files (by path, size and modification time)
+  were already ingested, so reruns only read new files. If an ingested file
+  changed or disappeared, its earlier rows cannot be told apart from the
+  rest, so changed_files() reports it and the caller starts over with
+  reset() and rebuilds its output from all files.
+"""
+
+import json
+import os
+import pathlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Union
+
+import pandas as pd
+
+MANIFEST_SUFFIXES = (".manifest", ".txt")
+GLOB_CHARACTERS = ("*", "?", "[")
+
+# Small-file reads wait on storage more than on the CPU, so use more threads than cores
+DEFAULT_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+
+def resolve_raw_sources(source: Union[str, pathlib.Path], base_dir: pathlib.Path) -> List[pathlib.Path]:
+    """
+    Resolve a file name, glob pattern, or manifest into an ordered list of files.
+
+    Parameters:
+        source (str or Path): File name, glob pattern, or manifest file, relative to base_dir.
+        base_dir (Path): Folder that relative names and patterns are resolved against.
+
+    Returns:
+        list: Paths of the files to read, sorted for patterns and in listed order for manifests.
+
+    Raises:
+        FileNotFoundError: If a named file, manifest entry, or pattern matches nothing.
+    """
+    source = str(source)
+    if any(char in source for char in GLOB_CHARACTERS):
+        paths = sorted(path for path in base_dir.glob(source) if path.is_file())
+        if not paths:
+            raise FileNotFoundError(f"No raw files match '{source}' in {base_dir}.")
+        return paths
+
+    path = base_dir.joinpath(source)
+    if path.suffix in MANIFEST_SUFFIXES:
+        # Manifest entries keep their listed order; relative entries are relative to the manifest
+        paths = []
+        for line in path.read_text(encoding="utf-8").splitlines():
+            entry = line.strip()
+            if entry and not entry.startswith("#"):
+                paths.append(path.parent.joinpath(entry))
+    else:
+        paths = [path]
+
+    for path in paths:
+        if not path.is_file():
+            raise FileNotFoundError(f"Raw file not found: {path}")
+    return paths
+
+
+class IngestLedger:
+    """Record of raw files that were already ingested, stored as JSON."""
+
+    def __init__(self, ledger_path: pathlib.Path):
+        """
+        Load the ledger, or start an empty one if the file does not exist yet.
+
+        Parameters:
+            ledger_path (Path): JSON file that holds the ledger.
+        """
+        self.ledger_path = pathlib.Path(ledger_path)
+        self.entries: Dict[str, Dict[str, int]] = {}
+        self.pending: Dict[str, Dict[str, int]] = {}
+        self.reset_pending = False
+        if self.ledger_path.exists():
+            self.entries = json.loads(self.ledger_path.read_text(encoding="utf-8"))
+
+    def _key(self, path: pathlib.Path) -> str:
+        # Files next to the ledger are keyed relative to it, so the project folder can move
+        path = pathlib.Path(path).resolve()
+        try:
+            return path.relative_to(self.ledger_path.parent.resolve()).as_posix()
+        except ValueError:
+            return str(path)
+
+    @staticmethod
+    def _fingerprint(path: pathlib.Path) -> Dict[str, int]:
+        stat = pathlib.Path(path).stat()
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def is_ingested(self, path: pathlib.Path) -> bool:
+        """Return True if this exact version of the file was already ingested."""
+        return self.entries.get(self._key(path)) == self._fingerprint(path)
+
+    def changed_files(self, paths: List[pathlib.Path]) -> List[str]:
+        """Return ledger keys of ingested files that changed since, or are no longer in `paths`."""
+        current = {self._key(path): path for path in paths}
+        return sorted(key for key, fingerprint in self.entries.items()
+                      if key not in current or self._fingerprint(current[key]) != fingerprint)
+
+    def reset(self) -> None:
+        """Forget all ingested files, so every file is read again. The ledger file is replaced on commit()."""
+        self.entries = {}
+        self.pending = {}
+        self.reset_pending = True
+
+    def record(self, paths: List[pathlib.Path]) -> None:
+        """Mark files as read. They are saved to the ledger by commit()."""
+        for path in paths:
+            self.pending[self._key(path)] = self._fingerprint(path)
+
+    def commit(self) -> None:
+        """Save recorded files to the ledger. Call once their data has been saved."""
+        if not self.pending and not self.reset_pending:
+            return
+        self.entries.update(self.pending)
+        self.pending = {}
+        self.reset_pending = False
+        self.ledger_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.ledger_path.with_name(self.ledger_path.name + ".tmp")
+        temp_path.write_text(json.dumps(self.entries, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(temp_path, self.ledger_path)
+
+
+def read_csv_files(paths: List[pathlib.Path], ledger: Optional[IngestLedger] = None,
+                   max_workers: int = DEFAULT_MAX_WORKERS, max_in_flight: Optional[int] = None,
+                   **read_csv_kwargs) -> pd.DataFrame:
+    """
+    Read CSV files concurrently and concatenate them in the given order.
+
+    Parameters:
+        paths (list): Files to read.
+        ledger (IngestLedger, optional): Skip files already in the ledger and record the ones read.
+        max_workers (int, optional): Number of reader threads.
+        max_in_flight (int, optional): Most files read but not yet concatenated at once.
+                                       Defaults to twice the number of threads.
+        read_csv_kwargs: Passed on to pd.read_csv.
+
+    Returns:
+        pd.DataFrame: Rows of all files read, or an empty DataFrame if there was nothing new.
+    """
+    if ledger is not None:
+        paths = [path for path in paths if not ledger.is_ingested(path)]
+    if not paths:
+        return pd.DataFrame()
+
+    max_in_flight = max(1, max_in_flight or 2 * max_workers)
+    frames = []
+    remaining = iter(paths)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        in_flight = deque()
+        for path in remaining:
+            in_flight.append(pool.submit(pd.read_csv, path, **read_csv_kwargs))
+            if len(in_flight) >= max_in_flight:
+                break
+        while in_flight:
+            # Wait for the oldest read so frames stay in file order
+            frames.append(in_flight.popleft().result())
+            path = next(remaining, None)
+            if path is not None:
+                in_flight.append(pool.submit(pd.read_csv, path, **read_csv_kwargs))
+
+    if ledger is not None:
+        ledger.record(paths)
+    return frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
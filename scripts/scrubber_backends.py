@@ -0,0 +1,261 @@
+r"""
+scripts/scrubber_backends.py
+
+Do not run this script directly.
+
+DataFrame engines used by the DataScrubber class (scripts.data_scrubber).
+Each backend implements the same small set of operations on its own
+native frame type:
+
+- PandasBackend works on pandas DataFrames and is the default.
+- PolarsBackend works on Polars DataFrames, which run each operation
+  multi-threaded over Arrow columns. Polars is an optional dependency and
+  is only imported when this backend is requested.
+
+Frames move between pandas and Polars through Arrow, so numeric columns
+without nulls convert without copying.
+"""
+
+import io
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+
+# Unit pd.to_datetime gives parsed text ("us" since pandas 3, "ns" before)
+_PANDAS_PARSED_DATETIME_UNIT = pd.to_datetime(pd.Series(["2000-01-01"])).dt.unit
+
+
+class PandasBackend:
+    """Run DataScrubber operations with pandas."""
+
+    name = "pandas"
+
+    def from_pandas(self, df: pd.DataFrame) -> pd.DataFrame:
+        return df
+
+    def to_pandas(self, frame: pd.DataFrame) -> pd.DataFrame:
+        return frame
+
+    def is_native(self, frame) -> bool:
+        return isinstance(frame, pd.DataFrame)
+
+    def columns(self, frame: pd.DataFrame) -> List[str]:
+        return list(frame.columns)
+
+    def null_counts(self, frame: pd.DataFrame) -> pd.Series:
+        return frame.isnull().sum()
+
+    def duplicate_count(self, frame: pd.DataFrame) -> int:
+        return frame.duplicated().sum()
+
+    def cast(self, frame: pd.DataFrame, column: str, new_type: type) -> pd.DataFrame:
+        frame[column] = frame[column].astype(new_type)
+        return frame
+
+    def drop_columns(self, frame: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+        return frame.drop(columns=columns)
+
+    def filter_between(self, frame: pd.DataFrame, column: str,
+                       lower_bound: Union[float, int], upper_bound: Union[float, int]) -> pd.DataFrame:
+        return frame[(frame[column] >= lower_bound) & (frame[column] <= upper_bound)]
+
+    def lower_and_trim(self, frame: pd.DataFrame, column: str) -> pd.DataFrame:
+        frame[column] = frame[column].str.lower().str.strip()
+        return frame
+
+    def upper_and_trim(self, frame: pd.DataFrame, column: str) -> pd.DataFrame:
+        frame[column] = frame[column].str.upper().str.strip()
+        return frame
+
+    def drop_missing(self, frame: pd.DataFrame) -> pd.DataFrame:
+        return frame.dropna()
+
+    def fill_missing(self, frame: pd.DataFrame, fill_value: Union[float, int, str]) -> pd.DataFrame:
+        return frame.fillna(fill_value)
+
+    def inspect(self, frame: pd.DataFrame) -> Tuple[str, str]:
+        buffer = io.StringIO()
+        frame.info(buf=buffer)
+        return buffer.getvalue(), frame.describe().to_string()
+
+    def parse_dates(self, frame: pd.DataFrame, column: str, new_column: str) -> pd.DataFrame:
+        frame[new_column] = pd.to_datetime(frame[column])
+        return frame
+
+    def drop_duplicates(self, frame: pd.DataFrame) -> pd.DataFrame:
+        return frame.drop_duplicates()
+
+    def rename(self, frame: pd.DataFrame, column_mapping: Dict[str, str]) -> pd.DataFrame:
+        return frame.rename(columns=column_mapping)
+
+    def select(self, frame: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+        return frame[columns]
+
+    def evaluate_rules(self, frame: pd.DataFrame, rules: list) -> np.ndarray:
+        # One vectorized pass over its columns per rule; only Polars fuses the rules into one query
+        passed = np.ones((len(rules), len(frame)), dtype=bool)
+        for i, rule in enumerate(rules):
+            passed[i] = rule.pandas_mask(frame)
+        return passed
+
+    def filter_rows(self, frame: pd.DataFrame, mask: np.ndarray) -> pd.DataFrame:
+        return frame[mask]
+
+
+class PolarsBackend:
+    """Run DataScrubber operations with Polars (multi-threaded, columnar)."""
+
+    name = "polars"
+
+    # Type names accepted by convert_column_to_new_data_type(), as Polars dtype names
+    _TYPE_NAMES = {
+        "float": "Float64", "float64": "Float64", "float32": "Float32",
+        "int": "Int64", "int64": "Int64", "int32": "Int32",
+        "str": "String", "string": "String", "object": "String",
+        "bool": "Boolean",
+    }
+
+    def __init__(self):
+        try:
+            import polars
+        except ImportError as e:
+            raise ImportError("The 'polars' backend requires the polars package. "
+                              "Install it with: python -m pip install polars pyarrow") from e
+        self.pl = polars
+
+    def from_pandas(self, df: pd.DataFrame):
+        # Arrow-backed conversion; NaN becomes null, as pandas treats both as missing
+        return self.pl.from_pandas(df, include_index=False, nan_to_null=True)
+
+    def to_pandas(self, frame) -> pd.DataFrame:
+        return frame.to_pandas()
+
+    def is_native(self, frame) -> bool:
+        return isinstance(frame, self.pl.DataFrame)
+
+    def columns(self, frame) -> List[str]:
+        return frame.columns
+
+    def null_counts(self, frame) -> pd.Series:
+        counts = frame.null_count()
+        return pd.Series(counts.row(0), index=counts.columns, dtype="int64")
+
+    def duplicate_count(self, frame) -> int:
+        # pandas counts every repeat after the first occurrence
+        return frame.height - frame.n_unique()
+
+    def cast(self, frame, column: str, new_type: type):
+        pl = self.pl
+        type_name = new_type if isinstance(new_type, str) else getattr(new_type, "__name__", str(new_type))
+        polars_type = self._TYPE_NAMES.get(type_name)
+        if polars_type in ("Int64", "Int32"):
+            # pandas cannot store missing values in a plain integer column, so it raises; do the same
+            values = frame.get_column(column)
+            missing = values.null_count() + (values.is_nan().sum() if values.dtype.is_float() else 0)
+            if missing:
+                raise pd.errors.IntCastingNaNError(
+                    f"Cannot convert non-finite values (NA or inf) to integer in column '{column}'.")
+        if polars_type is None:
+            # Types Polars has no direct match for go through pandas for this one column
+            converted = frame.get_column(column).to_pandas().astype(new_type)
+            return frame.with_columns(self.pl.from_pandas(converted).alias(column))
+        return frame.with_columns(pl.col(column).cast(getattr(pl, polars_type)))
+
+    def drop_columns(self, frame, columns: List[str]):
+        return frame.drop(columns)
+
+    def filter_between(self, frame, column: str,
+                       lower_bound: Union[float, int], upper_bound: Union[float, int]):
+        return frame.filter(self.pl.col(column).is_between(lower_bound, upper_bound))
+
+    def lower_and_trim(self, frame, column: str):
+        return frame.with_columns(self.pl.col(column).str.to_lowercase().str.strip_chars())
+
+    def upper_and_trim(self, frame, column: str):
+        return frame.with_columns(self.pl.col(column).str.to_uppercase().str.strip_chars())
+
+    def drop_missing(self, frame):
+        return frame.drop_nulls()
+
+    def fill_missing(self, frame, fill_value: Union[float, int, str]):
+        pl = self.pl
+        is_text = isinstance(fill_value, str)
+        exprs = []
+        for column, dtype in frame.schema.items():
+            if is_text and dtype != pl.String and frame.get_column(column).null_count():
+                # pandas would store the text in an object column; String is the closest match
+                exprs.append(pl.col(column).cast(pl.String).fill_null(fill_value))
+            elif is_text and dtype != pl.String:
+                continue
+            else:
+                exprs.append(pl.col(column).fill_null(fill_value))
+        return frame.with_columns(exprs) if exprs else frame
+
+    def inspect(self, frame) -> Tuple[str, str]:
+        schema = "\n".join(f"{name}: {dtype}" for name, dtype in frame.schema.items())
+        info_str = f"polars.DataFrame: {frame.height} rows, {frame.width} columns\n{schema}\n"
+        return info_str, str(frame.describe())
+
+    def parse_dates(self, frame, column: str, new_column: str):
+        pl = self.pl
+        dtype = frame.schema[column]
+        if dtype == pl.Datetime:
+            # pd.to_datetime keeps the unit of a datetime column
+            return frame.with_columns(pl.col(column).alias(new_column))
+        if dtype == pl.Date:
+            # Dates reach pandas as datetime64[ms]
+            return frame.with_columns(pl.col(column).cast(pl.Datetime("ms")).alias(new_column))
+        try:
+            return frame.with_columns(
+                pl.col(column).str.to_datetime(time_unit=_PANDAS_PARSED_DATETIME_UNIT).alias(new_column))
+        except Exception:
+            # Formats Polars cannot infer are parsed by pandas for this one column
+            parsed = pd.to_datetime(frame.get_column(column).to_pandas())
+            return frame.with_columns(pl.from_pandas(parsed).alias(new_column))
+
+    def drop_duplicates(self, frame):
+        return frame.unique(keep="first", maintain_order=True)
+
+    def rename(self, frame, column_mapping: Dict[str, str]):
+        return frame.rename(column_mapping)
+
+    def select(self, frame, columns: List[str]):
+        return frame.select(columns)
+
+    def evaluate_rules(self, frame, rules: list) -> np.ndarray:
+        passed = np.ones((len(rules), frame.height), dtype=bool)
+        exprs = {}
+        for i, rule in enumerate(rules):
+            expr = rule.polars_expr(self.pl, frame.schema)
+            if expr is None:
+                # Rules with no Polars form read only their own columns through pandas
+                passed[i] = rule.pandas_mask(frame.select(rule.columns).to_pandas())
+            else:
+                exprs[f"_rule_{i}"] = expr
+        if exprs:
+            # One query, so Polars evaluates all the rules in parallel in a single pass
+            result = frame.select(**exprs)
+            for name in result.columns:
+                passed[int(name.rsplit("_", 1)[1])] = result.get_column(name).to_numpy()
+        return passed
+
+    def filter_rows(self, frame, mask: np.ndarray):
+        return frame.filter(self.pl.Series(mask))
+
+
+BACKENDS = {"pandas": PandasBackend, "polars": PolarsBackend}
+
+
+def get_backend(name: str):
+    """
+    Create the backend with the given name.
+
+    Raises:
+        ValueError: If the backend name is not known.
+    """
+    try:
+        return BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown DataScrubber backend '{name}'. Choose one of: {', '.join(BACKENDS)}.")
@@ -0,0 +1,350 @@
+r"""
+scripts/validation_rules.py
+
+Do not run this script directly.
+Instead, pass rule dictionaries to DataScrubber.apply_validation_rules().
+
+Declarative validation rules. Each rule is a small dictionary, for example:
+
+    rules = [
+        {"rule": "not_null", "columns": ["TransactionID", "SaleDate"]},
+        {"rule": "range", "column": "DiscountPercent", "min": 0, "max": 100},
+        {"rule": "enum", "column": "PaymentType", "values": ["Cash", "Credit", "Debit"]},
+        {"rule": "regex", "column": "Name", "pattern": r"^[A-Za-z .'-]+$"},
+        {"rule": "compare", "left": "SaleAmount", "op": "<=", "right": "CreditLimit"},
+        {"rule": "date_window", "column": "SaleDate", "start": "2023-01-01", "end": "2024-12-31"},
+        {"rule": "unique", "columns": ["TransactionID"]},
+    ]
+
+`compile_rules()` turns them into rule objects. The backends collect the
+results of all compiled rules into one boolean matrix per batch (one row per
+rule). pandas evaluates the rules one after another; Polars runs all the
+rules it can express as a single multi-threaded query.
+
+Only not_null rules reject missing values; every other rule lets a missing
+value pass, so each problem is reported by exactly one rule. The exception
+is unique, which compares whole rows (or the listed columns) and treats
+missing values as equal, as DataFrame.duplicated() does. It passes the
+first occurrence and fails every repeat.
+"""
+
+import operator
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# What DataScrubber.apply_validation_rules() does with rows that break a rule
+VALIDATION_POLICIES = ("report", "drop", "quarantine", "fail")
+
+_COMPARISONS = {
+    "<": operator.lt, "<=": operator.le, ">": operator.gt,
+    ">=": operator.ge, "==": operator.eq, "!=": operator.ne,
+}
+
+
+class ValidationRule:
+    """Base class for a compiled validation rule."""
+
+    kind = ""
+
+    def __init__(self, name: Optional[str] = None):
+        self.name = name or self.default_name()
+
+    def default_name(self) -> str:
+        return self.kind
+
+    @property
+    def columns(self) -> List[str]:
+        """Columns the rule reads."""
+        return []
+
+    def pandas_mask(self, df: pd.DataFrame) -> np.ndarray:
+        """Return a boolean array that is True where a row passes the rule."""
+        raise NotImplementedError
+
+    def polars_expr(self, pl, schema) -> Optional[object]:
+        """Return a Polars expression that is True where a row passes, or None if not expressible."""
+        return None
+
+
+class NotNullRule(ValidationRule):
+    kind = "not_null"
+
+    def __init__(self, columns: List[str], name: Optional[str] = None):
+        self._columns = [columns] if isinstance(columns, str) else list(columns)
+        super().__init__(name)
+
+    def default_name(self) -> str:
+        return f"not_null({', '.join(self._columns)})"
+
+    @property
+    def columns(self) -> List[str]:
+        return self._columns
+
+    def pandas_mask(self, df: pd.DataFrame) -> np.ndarray:
+        return df[self._columns].notna().to_numpy().all(axis=1)
+
+    def polars_expr(self, pl, schema):
+        # NaN counts as missing in pandas, so treat float NaN the same way
+        exprs = [pl.col(c).is_not_null() & ~pl.col(c).is_nan() if schema[c].is_float()
+                 else pl.col(c).is_not_null() for c in self._columns]
+        return pl.all_horizontal(exprs)
+
+
+class RangeRule(ValidationRule):
+    kind = "range"
+
+    def __init__(self, column: str, min=None, max=None, name: Optional[str] = None):
+        if min is None and max is None:
+            raise ValueError("A range rule needs at least one of 'min' or 'max'.")
+        self.column, self.min, self.max = column, min, max
+        super().__init__(name)
+
+    def default_name(self) -> str:
+        return f"range({self.column}, {self.min}, {self.max})"
+
+    @property
+    def columns(self) -> List[str]:
+        return [self.column]
+
+    def pandas_mask(self, df: pd.DataFrame) -> np.ndarray:
+        values = df[self.column]
+        ok = values.isna().to_numpy().copy()
+        inside = np.ones(len(values), dtype=bool)
+        # Nullable dtypes compare to NA at missing values; those rows already pass through `ok`
+        if self.min is not None:
+            inside &= (values >= self.min).to_numpy(dtype=bool, na_value=False)
+        if self.max is not None:
+            inside &= (values <= self.max).to_numpy(dtype=bool, na_value=False)
+        return ok | inside
+
+    def polars_expr(self, pl, schema):
+        col = pl.col(self.column)
+        inside = pl.lit(True)
+        if self.min is not None:
+            inside = inside & (col >= self.min)
+        if self.max is not None:
+            inside = inside & (col <= self.max)
+        missing = col.is_null() | col.is_nan() if schema[self.column].is_float() else col.is_null()
+        return missing | inside.fill_null(False)
+
+
+class EnumRule(ValidationRule):
+    kind = "enum"
+
+    def __init__(self, column: str, values: list, name: Optional[str] = None):
+        self.column, self.values = column, list(values)
+        super().__init__(name)
+
+    def default_name(self) -> str:
+        return f"enum({self.column})"
+
+    @property
+    def columns(self) -> List[str]:
+        return [self.column]
+
+    def pandas_mask(self, df: pd.DataFrame) -> np.ndarray:
+        values = df[self.column]
+        return (values.isna() | values.isin(self.values)).to_numpy()
+
+    def polars_expr(self, pl, schema):
+        col = pl.col(self.column)
+        return col.is_null() | col.is_in(self.values).fill_null(False)
+
+
+class RegexRule(ValidationRule):
+    kind = "regex"
+
+    def __init__(self, column: str, pattern: str, name: Optional[str] = None):
+        self.column, self.pattern = column, pattern
+        super().__init__(name)
+
+    def default_name(self) -> str:
+        return f"regex({self.column})"
+
+    @property
+    def columns(self) -> List[str]:
+        return [self.column]
+
+    def pandas_mask(self, df: pd.DataFrame) -> np.ndarray:
+        values = df[self.column]
+        matched = values.astype("string").str.contains(self.pattern, regex=True)
+        return (values.isna() | matched.fillna(False)).to_numpy(dtype=bool)
+
+    def polars_expr(self, pl, schema):
+        # Polars uses the Rust regex dialect, which has no look-around or back-references
+        col = pl.col(self.column)
+        return col.is_null() | col.cast(pl.String).str.contains(self.pattern).fill_null(False)
+
+
+class CompareRule(ValidationRule):
+    kind = "compare"
+
+    def __init__(self, left: str, op: str, right: str, name: Optional[str] = None):
+        if op not in _COMPARISONS:
+            raise ValueError(f"Unknown comparison '{op}'. Choose one of: {', '.join(_COMPARISONS)}.")
+        self.left, self.op, self.right = left, op, right
+        super().__init__(name)
+
+    def default_name(self) -> str:
+        return f"compare({self.left} {self.op} {self.right})"
+
+    @property
+    def columns(self) -> List[str]:
+        return [self.left, self.right]
+
+    def pandas_mask(self, df: pd.DataFrame) -> np.ndarray:
+        left, right = df[self.left], df[self.right]
+        missing = (left.isna() | right.isna()).to_numpy()
+        return missing | _COMPARISONS[self.op](left, right).to_numpy(dtype=bool, na_value=False)
+
+    def polars_expr(self, pl, schema):
+        left, right = pl.col(self.left), pl.col(self.right)
+        missing = left.is_null() | right.is_null()
+        for name, col in ((self.left, left), (self.right, right)):
+            if schema[name].is_float():
+                missing = missing | col.is_nan()
+        return missing | _COMPARISONS[self.op](left, right).fill_null(False)
+
+
+class DateWindowRule(ValidationRule):
+    kind = "date_window"
+
+    def __init__(self, column: str, start=None, end=None, name: Optional[str] = None):
+        if start is None and end is None:
+            raise ValueError("A date_window rule needs at least one of 'start' or 'end'.")
+        self.column = column
+        self.start = pd.Timestamp(start) if start is not None else None
+        self.end = pd.Timestamp(end) if end is not None else None
+        super().__init__(name)
+
+    def default_name(self) -> str:
+        return f"date_window({self.column})"
+
+    @property
+    def columns(self) -> List[str]:
+        return [self.column]
+
+    def pandas_mask(self, df: pd.DataFrame) -> np.ndarray:
+        values = df[self.column]
+        dates = values if pd.api.types.is_datetime64_any_dtype(values) else pd.to_datetime(
+            values, errors="coerce", format="mixed")
+        inside = dates.notna()
+        if self.start is not None:
+            inside &= dates >= self.start
+        if self.end is not None:
+            inside &= dates <= self.end
+        # Values that cannot be parsed as dates break the rule; missing values do not
+        return (values.isna() | inside).to_numpy()
+
+    def polars_expr(self, pl, schema):
+        if not schema[self.column].is_temporal():
+            # Text dates are parsed by pandas so both backends accept the same formats
+            return None
+        col = pl.col(self.column)
+        inside = pl.lit(True)
+        if self.start is not None:
+            inside = inside & (col >= pl.lit(self.start.to_pydatetime()))
+        if self.end is not None:
+            inside = inside & (col <= pl.lit(self.end.to_pydatetime()))
+        return col.is_null() | inside.fill_null(False)
+
+
+class UniqueRule(ValidationRule):
+    kind = "unique"
+
+    def __init__(self, columns: Optional[List[str]] = None, name: Optional[str] = None):
+        # No columns means whole rows must be unique
+        self._columns = [columns] if isinstance(columns, str) else list(columns or [])
+        super().__init__(name)
+
+    def default_name(self) -> str:
+        return f"unique({', '.join(self._columns) or 'all columns'})"
+
+    @property
+    def columns(self) -> List[str]:
+        return self._columns
+
+    def pandas_mask(self, df: pd.DataFrame) -> np.ndarray:
+        return ~df.duplicated(subset=self._columns or None).to_numpy()
+
+    def polars_expr(self, pl, schema):
+        return pl.struct(self._columns or list(schema)).is_first_distinct()
+
+
+RULE_TYPES = {
+    rule.kind: rule
+    for rule in (NotNullRule, RangeRule, EnumRule, RegexRule, CompareRule, DateWindowRule, UniqueRule)
+}
+
+
+def compile_rules(specs: List[Dict]) -> List[ValidationRule]:
+    """
+    Turn rule dictionaries into rule objects.
+
+    Raises:
+        ValueError: If a rule type is unknown, a rule is missing options, or two rules share a name.
+    """
+    rules = []
+    for spec in specs:
+        if isinstance(spec, ValidationRule):
+            rules.append(spec)
+            continue
+        options = dict(spec)
+        kind = options.pop("rule", None)
+        if kind not in RULE_TYPES:
+            raise ValueError(f"Unknown validation rule '{kind}'. Choose one of: {', '.join(RULE_TYPES)}.")
+        try:
+            rules.append(RULE_TYPES[kind](**options))
+        except TypeError as e:
+            raise ValueError(f"Invalid options for '{kind}' rule: {e}")
+    names = [rule.name for rule in rules]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Validation rule names must be unique; repeated: {', '.join(duplicates)}.")
+    return rules
+
+
+class ValidationResult:
+    """Outcome of validating one batch of rows."""
+
+    def __init__(self, rules: List[ValidationRule], passed: np.ndarray, policy: str):
+        """
+        Parameters:
+            rules (list): Compiled rules, in evaluation order.
+            passed (np.ndarray): Boolean matrix, one row per rule, True where a row passes.
+            policy (str): Policy that was applied.
+        """
+        self.rules = rules
+        self.passed = passed
+        self.policy = policy
+        self.quarantine: Optional[pd.DataFrame] = None
+
+    @property
+    def row_count(self) -> int:
+        return self.passed.shape[1]
+
+    @property
+    def valid_mask(self) -> np.ndarray:
+        """True for rows that pass every rule."""
+        return self.passed.all(axis=0)
+
+    @property
+    def violation_masks(self) -> Dict[str, np.ndarray]:
+        """Rule name to a boolean array that is True where a row breaks that rule."""
+        return {rule.name: ~self.passed[i] for i, rule in enumerate(self.rules)}
+
+    @property
+    def violation_counts(self) -> Dict[str, int]:
+        """Rule name to the number of rows that break it."""
+        counts = self.row_count - self.passed.sum(axis=1)
+        return {rule.name: int(count) for rule, count in zip(self.rules, counts)}
+
+    @property
+    def invalid_count(self) -> int:
+        return int(self.row_count - self.valid_mask.sum())
+
+    def summary(self) -> str:
+        broken = [f"{name}: {count}" for name, count in self.violation_counts.items() if count]
+        return f"{self.invalid_count} of {self.row_count} rows failed validation ({'; '.join(broken) or 'none'})."
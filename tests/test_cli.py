@@ -0,0 +1,102 @@
+r"""
+tests/test_cli.py
+
+To run, open a terminal in the root project folder.
+Activate your virtual environment if needed, and run one of the following commands:
+
+    py tests\test_cli.py
+    python3 tests\test_cli.py
+
+This test suite verifies the pipeline entry point in scripts/cli.py and that
+importing project modules has no side effects.
+"""
+
+import importlib
+import importlib.util
+import unittest
+import pathlib
+import shutil
+import subprocess
+import sys
+import tempfile
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from scripts.cli import COMMANDS, build_parser, parse_import_times  # noqa: E402
+
+
+def run_python(code: str, cwd: pathlib.Path = PROJECT_ROOT) -> str:
+    """Run code in a fresh interpreter and return its stdout."""
+    result = subprocess.run([sys.executable, "-c", code], cwd=cwd,
+                            capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+
+class TestCli(unittest.TestCase):
+
+    def test_parser_accepts_each_command(self):
+        """Test that every stage is a subcommand and --import-time is a global option."""
+        parser = build_parser()
+        for name in COMMANDS:
+            args = parser.parse_args([name])
+            self.assertEqual(args.command, name)
+            self.assertFalse(args.import_time)
+        self.assertTrue(parser.parse_args(["--import-time", "cube"]).import_time)
+        with self.assertRaises(SystemExit):
+            parser.parse_args(["unknown"])
+
+    def test_parse_import_times(self):
+        """Test parsing of `python -X importtime` output, including nesting depth."""
+        stderr = "\n".join([
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |     numpy.core",
+            "import time:        80 |        200 |   numpy",
+            "import time:        30 |        230 | olap.script",
+            "some other warning",
+        ])
+        self.assertEqual(parse_import_times(stderr), [
+            ("numpy.core", 2, 120, 120),
+            ("numpy", 1, 80, 200),
+            ("olap.script", 0, 30, 230),
+        ])
+
+    @unittest.skipUnless(importlib.util.find_spec("tomllib"), "tomllib needs Python 3.11+")
+    def test_installed_command_runs_cli_main(self):
+        """Test that the console script in pyproject.toml points at the CLI entry function."""
+        import tomllib
+        with open(PROJECT_ROOT.joinpath("pyproject.toml"), "rb") as f:
+            scripts = tomllib.load(f)["project"]["scripts"]
+        module_name, function_name = scripts[build_parser().prog].split(":")
+        self.assertEqual((module_name, function_name), ("scripts.cli", "main"))
+        self.assertTrue(callable(getattr(importlib.import_module(module_name), function_name)))
+
+    def test_cli_import_does_not_load_stages(self):
+        """Test that the entry point itself imports no stage module and no pandas."""
+        loaded = run_python("import sys, scripts.cli; "
+                            "print(sorted(m for m in sys.modules if m.split('.')[0] in ('pandas', 'olap') "
+                            "or m in ('scripts.data_prep', 'scripts.etl_to_dw')))")
+        self.assertEqual(loaded, "[]")
+
+    def test_imports_have_no_side_effects(self):
+        """Test that importing the stage modules adds no log sink and creates no folder."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # A copy of the modules in an empty project, imported from another working folder
+            root, cwd = pathlib.Path(temp_dir, "project"), pathlib.Path(temp_dir, "cwd")
+            for package in ("utils", "scripts", "olap"):
+                shutil.copytree(PROJECT_ROOT.joinpath(package), root.joinpath(package),
+                                ignore=shutil.ignore_patterns("__pycache__", "*.pbix", "data_preparation"))
+            cwd.mkdir()
+            modules = ", ".join(module for module, _, _ in COMMANDS.values())
+            output = run_python(f"import sys; sys.path.insert(0, {str(root)!r}); "
+                                f"import utils.logger, {modules}; print(utils.logger._file_sink_id)", cwd=cwd)
+            self.assertEqual(output, "None", "Importing the logger added a log file sink")
+            self.assertEqual(sorted(path.name for path in root.iterdir()), ["olap", "scripts", "utils"],
+                             "Importing created folders in the project")
+            self.assertEqual(list(cwd.iterdir()), [], "Importing created folders in the working folder")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,8 +8,10 @@ Activate your virtual environment if needed, and run one of the following comman
     python3 tests\test_data_scrubber.py
 
 This test suite verifies that each function in the DataScrubber class works as expected.
+The same tests run against the pandas backend and, if polars is installed, the polars backend.
 """
 
+import importlib.util
 import unittest
 import pathlib
 import sys
@@ -40,10 +42,63 @@ df = pd.read_csv(csv_data)
 
 
 class TestDataScrubber(unittest.TestCase):
+    backend = "pandas"
 
     def setUp(self):
         """Set up a fresh instance of DataScrubber before each test."""
-        self.scrubber = DataScrubber(df.copy())
+        self.scrubber = DataScrubber(df.copy(), backend=self.backend)
+
+    def test_apply_validation_rules_reports_violations(self):
+        rules = [
+            {"rule": "not_null", "columns": ["Score"]},
+            {"rule": "range", "column": "Score", "min": 10, "max": 25},
+            {"rule": "enum", "column": "Name", "values": ["Alice", "Bob", "Charlie", "Eve"]},
+            {"rule": "regex", "column": "Name", "pattern": r"^[A-Z][a-z]+$"},
+            {"rule": "compare", "left": "ID", "op": "<", "right": "Score", "name": "id_below_score"},
+            {"rule": "date_window", "column": "Date", "start": "2023-01-01", "end": "2023-01-04"},
+        ]
+        result = self.scrubber.apply_validation_rules(rules)
+        self.assertEqual(list(result.violation_counts.values()), [1, 1, 0, 0, 0, 2], "Violation counts not correct")
+        self.assertEqual(result.violation_masks["id_below_score"].sum(), 0, "Cross-column rule not evaluated correctly")
+        self.assertEqual(result.valid_mask.tolist(), [True, True, True, False, False, False], "Valid rows not correct")
+        self.assertEqual(len(self.scrubber.df), 6, "Report policy should not remove rows")
+
+    def test_apply_validation_rules_drop_and_quarantine(self):
+        rules = [{"rule": "range", "column": "Score", "max": 20}]
+        result = self.scrubber.apply_validation_rules(rules, policy="quarantine")
+        self.assertEqual(result.quarantine['Score'].tolist(), [25, 30], "Quarantined rows not correct")
+        self.assertEqual(self.scrubber.df['ID'].tolist(), [1, 2, 3, 4], "Invalid rows not removed")
+        self.scrubber.apply_validation_rules([{"rule": "not_null", "columns": ["Score"]}], policy="drop")
+        self.assertEqual(self.scrubber.df['ID'].tolist(), [1, 2, 3], "Null rows not dropped")
+
+    def test_apply_validation_rules_nullable_dtypes(self):
+        nullable = pd.DataFrame({
+            "Low": pd.array([1, None, 5, 2], dtype="Int64"),
+            "High": pd.array([2.0, 1.0, None, 1.5], dtype="Float64"),
+        })
+        rules = [
+            {"rule": "range", "column": "Low", "min": 0, "max": 3},
+            {"rule": "compare", "left": "Low", "op": "<", "right": "High"},
+        ]
+        result = DataScrubber(nullable, backend=self.backend).apply_validation_rules(rules)
+        self.assertEqual(list(result.violation_counts.values()), [1, 1], "Nullable columns not validated correctly")
+        self.assertEqual(result.valid_mask.tolist(), [True, True, False, False], "Missing values should pass")
+
+    def test_apply_validation_rules_unique(self):
+        rules = [{"rule": "unique", "columns": ["ID"]}, {"rule": "unique", "name": "whole_rows"}]
+        result = self.scrubber.apply_validation_rules(rules)
+        self.assertEqual(result.violation_masks["unique(ID)"].tolist(), [False] * 5 + [True], "Repeated ID not found")
+        self.assertEqual(result.violation_counts["whole_rows"], 0, "Rows differ in Score, so none repeat")
+
+    def test_check_data_consistency_after_cleaning_raises_on_dirty_data(self):
+        with self.assertRaises(ValueError):
+            self.scrubber.check_data_consistency_after_cleaning()
+
+    def test_apply_validation_rules_fail_policy(self):
+        with self.assertRaises(ValueError):
+            self.scrubber.apply_validation_rules([{"rule": "not_null", "columns": ["Score"]}], policy="fail")
+        with self.assertRaises(ValueError):
+            self.scrubber.apply_validation_rules([{"rule": "range", "column": "Missing", "min": 0}])
 
     def test_check_data_consistency_before_cleaning(self):
         """Test data consistency check before cleaning."""
@@ -113,6 +168,35 @@ class TestDataScrubber(unittest.TestCase):
         self.assertEqual(df_reordered.columns.tolist(), ['Name', 'ID', 'Date'], "Columns not reordered correctly")
 
 
+@unittest.skipUnless(importlib.util.find_spec("polars"), "polars is not installed")
+class TestDataScrubberPolars(TestDataScrubber):
+    backend = "polars"
+
+    def test_results_match_pandas_backend(self):
+        """Test that a cleaning chain gives the same data on both backends."""
+        pandas_scrubber = DataScrubber(df.copy())
+        for scrubber in (pandas_scrubber, self.scrubber):
+            scrubber.handle_missing_data(fill_value=0)
+            scrubber.remove_duplicate_records()
+            scrubber.format_column_strings_to_upper_and_trim('Name')
+            scrubber.filter_column_outliers('Score', 12, 30)
+            scrubber.parse_dates_to_add_standard_datetime('Date')
+        # pandas keeps the labels of the remaining rows; Polars has no row labels (see DataScrubber docs)
+        self.assertEqual(pandas_scrubber.df.index.tolist(), [1, 2, 4, 5])
+        self.assertIsInstance(self.scrubber.df.index, pd.RangeIndex)
+        pd.testing.assert_frame_equal(self.scrubber.df.set_index(pandas_scrubber.df.index), pandas_scrubber.df)
+
+    def test_convert_to_int_with_missing_values_raises_like_pandas(self):
+        """Test that casting a column with missing values to int raises on both backends."""
+        for scrubber in (DataScrubber(df.copy()), self.scrubber):
+            with self.assertRaises(pd.errors.IntCastingNaNError):
+                scrubber.convert_column_to_new_data_type('Score', int)
+
+    def test_native_frame_is_polars(self):
+        import polars
+        self.assertIsInstance(self.scrubber.frame, polars.DataFrame)
+
+
 # Run the tests with verbosity=2 for detailed output
 if __name__ == "__main__":
     unittest.main(verbosity=2)
\ No newline at end of file
@@ -0,0 +1,244 @@
+r"""
+tests/test_olap_cube.py
+
+To run, open a terminal in the root project folder.
+Activate your virtual environment if needed, and run one of the following commands:
+
+    py tests\test_olap_cube.py
+    python3 tests\test_olap_cube.py
+
+This test suite verifies the OLAP cube helpers in the olap folder.
+"""
+
+import unittest
+import pathlib
+import sys
+import numpy as np
+import pandas as pd
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from olap.script import create_olap_cube, rollup_cube  # noqa: E402
+from olap.parallel_cube import can_aggregate_in_parallel  # noqa: E402
+from olap.enrichment import DimensionLookup  # noqa: E402
+from olap.rolling_features import LATE_DAYS, update_rolling_features  # noqa: E402
+from olap.sketches import DDSketch, HyperLogLog, sketch_from_string  # noqa: E402
+
+PREPARED_DATA_DIR = PROJECT_ROOT.joinpath("data", "prepared")
+
+
+def load_prepared_sales() -> pd.DataFrame:
+    """Build the same fact frame as olap/script.py main() from the prepared CSV files."""
+    sales = pd.read_csv(PREPARED_DATA_DIR.joinpath("sales_data_prepared.csv"))
+    customers = pd.read_csv(PREPARED_DATA_DIR.joinpath("customers_data_prepared.csv"))
+    df = pd.merge(sales, customers[["customer_id", "region"]], on="customer_id", how="left")
+    df["sale_date"] = pd.to_datetime(df["sale_date"])
+    df["day_of_week"] = df["sale_date"].dt.day_name()
+    df["month"] = df["sale_date"].dt.month
+    df["month_name"] = df["sale_date"].dt.month_name()
+    df["date"] = df["sale_date"].dt.strftime("%m/%d/%y")
+    return df
+
+
+class TestParallelCube(unittest.TestCase):
+
+    def setUp(self):
+        self.metrics = {"sale_amount": ["sum", "mean"], "transaction_id": "count"}
+
+    def test_parallel_cube_matches_serial_on_prepared_data(self):
+        df = load_prepared_sales()
+        dimensions = ["date", "day_of_week", "product_id", "customer_id", "month", "month_name", "region"]
+        serial = create_olap_cube(df, dimensions, self.metrics)
+        parallel = create_olap_cube(df, dimensions, self.metrics, workers=3, min_parallel_rows=0)
+        pd.testing.assert_frame_equal(serial, parallel)
+
+    def test_parallel_cube_matches_serial_with_repeats_and_missing_keys(self):
+        rng = np.random.default_rng(7)
+        n = 5000
+        df = pd.DataFrame({
+            "transaction_id": np.arange(n),
+            "region": rng.choice(["East", "West", "North", None], n),
+            "store_id": rng.integers(400, 410, n),
+            "sale_amount": rng.gamma(2.0, 50.0, n).round(2),
+        })
+        df.loc[::17, "sale_amount"] = np.nan
+        metrics = {"sale_amount": ["sum", "mean", "min", "max", "count"], "transaction_id": "count"}
+        serial = create_olap_cube(df, ["region", "store_id"], metrics)
+        parallel = create_olap_cube(df, ["region", "store_id"], metrics, workers=4, min_parallel_rows=0)
+        pd.testing.assert_frame_equal(serial, parallel)
+
+    def test_unsupported_reducer_is_not_parallelized(self):
+        df = load_prepared_sales()
+        self.assertFalse(can_aggregate_in_parallel(df, ["region"], {"sale_amount": "median"}))
+        self.assertFalse(can_aggregate_in_parallel(df, ["region"], {"payment_type": "count"}))
+
+
+class TestSketchMetrics(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        n = 20000
+        self.df = pd.DataFrame({
+            "transaction_id": np.arange(n),
+            "region": rng.choice(["East", "West", "North", "South"], n),
+            "store_id": rng.integers(400, 420, n),
+            "customer_id": rng.integers(1001, 6001, n),
+            "sale_amount": rng.gamma(2.0, 50.0, n),
+        })
+        self.metrics = {"sale_amount": ["sum", "count", "mean", "ddsketch"],
+                        "transaction_id": "count", "customer_id": "hll"}
+
+    def test_rollup_merges_sketches_without_rescanning_facts(self):
+        fine = create_olap_cube(self.df, ["region", "store_id"], self.metrics)
+        rolled = rollup_cube(fine, ["region"])
+        exact = self.df.groupby("region")
+
+        estimates = rolled["customer_id_hll"].map(HyperLogLog.estimate).to_numpy()
+        distinct = exact["customer_id"].nunique().to_numpy()
+        np.testing.assert_allclose(estimates, distinct, rtol=0.05)
+
+        medians = rolled["sale_amount_ddsketch"].map(lambda s: s.quantile(0.5)).to_numpy()
+        np.testing.assert_allclose(medians, exact["sale_amount"].median().to_numpy(), rtol=0.03)
+        np.testing.assert_allclose(rolled["sale_amount_mean"], exact["sale_amount"].mean().to_numpy())
+        self.assertEqual(rolled["transaction_id_count"].sum(), len(self.df))
+
+    def test_parallel_sketches_match_serial(self):
+        serial = create_olap_cube(self.df, ["region", "store_id"], self.metrics)
+        parallel = create_olap_cube(self.df, ["region", "store_id"], self.metrics, workers=3, min_parallel_rows=0)
+        for col in ["customer_id_hll", "sale_amount_ddsketch"]:
+            self.assertEqual(serial[col].map(str).tolist(), parallel[col].map(str).tolist())
+
+    def test_sketches_round_trip_through_strings(self):
+        hll = HyperLogLog().add(range(50000))
+        self.assertEqual(sketch_from_string(str(hll)).estimate(), hll.estimate())
+        dds = DDSketch().add([-5.0, 0.0, 2.5, 10.0, 250.0])
+        self.assertAlmostEqual(sketch_from_string(str(dds)).quantile(0.75), dds.quantile(0.75))
+        self.assertAlmostEqual(dds.quantile(1.0), 250.0, delta=2.5)
+
+
+class TestDimensionLookup(unittest.TestCase):
+
+    def setUp(self):
+        self.sales = pd.read_csv(PREPARED_DATA_DIR.joinpath("sales_data_prepared.csv"))
+        self.products = pd.read_csv(PREPARED_DATA_DIR.joinpath("products_data_prepared.csv"))
+        # Include a product that is not in the dimension table and one missing key
+        self.sales.loc[0, "product_id"] = 999
+        self.sales["product_id"] = self.sales["product_id"].astype("float64")
+        self.sales.loc[1, "product_id"] = np.nan
+
+    def assert_matches_left_merge(self, products):
+        expected = pd.merge(self.sales, products[["product_id", "category", "supplier"]],
+                            on="product_id", how="left")
+        lookup = DimensionLookup(products, "product_id", ["category", "supplier"])
+        enriched = lookup.attach(self.sales.copy())
+        pd.testing.assert_frame_equal(enriched, expected)
+
+    def test_dense_lookup_matches_left_merge(self):
+        self.assertIsNotNone(DimensionLookup(self.products, "product_id", ["category"]).dense)
+        self.assert_matches_left_merge(self.products)
+
+    def test_sorted_lookup_matches_left_merge(self):
+        products = self.products.copy()
+        products.loc[len(products)] = [10_000_000, "widget", "Gadgets", 1.0, 1, "Acme"]
+        self.assertIsNone(DimensionLookup(products, "product_id", ["category"]).dense)
+        self.assert_matches_left_merge(products)
+
+    def test_dense_lookup_keeps_large_integer_keys_exact(self):
+        base = 2 ** 53
+        dim = pd.DataFrame({"key": np.arange(base, base + 4, dtype=np.int64), "name": list("abcd")})
+        lookup = DimensionLookup(dim, "key", ["name"])
+        self.assertIsNotNone(lookup.dense)
+        # base + 1 and base + 3 round to other keys as float64
+        facts = pd.Series([base + 1, base + 3, base + 4, -1], dtype="int64")
+        self.assertEqual(lookup.positions(facts).tolist(), [1, 3, -1, -1])
+        self.assertEqual(lookup.positions(facts.astype("Int64")).tolist(), [1, 3, -1, -1])
+        self.assertEqual(lookup.positions(pd.Series([np.inf, -np.inf, np.nan, 2.5])).tolist(), [-1, -1, -1, -1])
+
+    def test_duplicate_dimension_keys_raise(self):
+        products = pd.concat([self.products, self.products.head(1)])
+        with self.assertRaises(ValueError):
+            DimensionLookup(products, "product_id", ["category"])
+
+
+class TestRollingFeatures(unittest.TestCase):
+
+    def setUp(self):
+        self.sales = pd.read_csv(PREPARED_DATA_DIR.joinpath("sales_data_prepared.csv"))
+
+    def test_windows_match_brute_force(self):
+        features, _, _ = update_rolling_features(self.sales)
+        sales = self.sales.assign(sale_date=pd.to_datetime(self.sales["sale_date"]))
+        for row in features[features["key_type"] == "customer_id"].itertuples():
+            day = pd.Timestamp(np.datetime64(int(row.day), "D"))
+            rows = sales[sales["customer_id"] == row.key_id]
+            window = rows[(rows["sale_date"] > day - pd.Timedelta(days=28)) & (rows["sale_date"] <= day)]
+            self.assertAlmostEqual(row.sales_sum_28d, window["sale_amount"].sum())
+            self.assertEqual(row.sales_count_28d, len(window))
+            earlier = rows.loc[rows["sale_date"] < day, "sale_date"]
+            expected_gap = (day - earlier.max()).days if len(earlier) else None
+            self.assertEqual(None if pd.isna(row.days_since_last_purchase) else row.days_since_last_purchase,
+                             expected_gap)
+
+    def test_sale_with_missing_amount_is_counted(self):
+        sales = self.sales.copy()
+        sales.loc[0, "sale_amount"] = np.nan
+        features, _, _ = update_rolling_features(sales)
+        customer = features[(features["key_type"] == "customer_id")
+                            & (features["key_id"] == sales.loc[0, "customer_id"])]
+        day = pd.to_datetime(sales["sale_date"]).to_numpy().astype("datetime64[D]").astype(np.int64)
+        same_key = (sales["customer_id"] == sales.loc[0, "customer_id"]).to_numpy()
+        row = customer[customer["day"] == day[0]].iloc[0]
+        window = same_key & (day > day[0] - 28) & (day <= day[0])
+        self.assertEqual(row.sales_count_28d, window.sum())
+        self.assertAlmostEqual(row.sales_sum_28d, sales.loc[window, "sale_amount"].sum())
+
+    @staticmethod
+    def apply_update(features: pd.DataFrame, update: pd.DataFrame) -> pd.DataFrame:
+        """Replace feature rows for the same key and day, as the warehouse table does."""
+        order = ["key_type", "key_id", "day"]
+        kept = features.merge(update[order], on=order, how="left", indicator=True)
+        kept = kept[kept.pop("_merge") == "left_only"]
+        return pd.concat([kept, update], ignore_index=True).sort_values(order, ignore_index=True)
+
+    def assert_matches_full_recompute(self, features: pd.DataFrame) -> None:
+        full, _, _ = update_rolling_features(self.sales)
+        order = ["key_type", "key_id", "day"]
+        pd.testing.assert_frame_equal(features.sort_values(order, ignore_index=True),
+                                      full.sort_values(order, ignore_index=True),
+                                      check_exact=False, rtol=1e-9)
+
+    def test_incremental_update_matches_full_recompute(self):
+        earlier = self.sales["sale_date"] <= "2024-05-31"
+        first, state, _ = update_rolling_features(self.sales[earlier])
+        second, state, skipped = update_rolling_features(self.sales[~earlier], state)
+        self.assertEqual(skipped, 0)
+        self.assert_matches_full_recompute(self.apply_update(first, second))
+        self.assertLess(len(state), len(self.sales) * 3, "Window state should only keep recent days")
+
+    def test_late_sale_for_processed_day_updates_features(self):
+        # One store's drop for a day arrives after later days were already processed
+        last_day = self.sales["sale_date"].max()
+        late = ((self.sales["sale_date"] < last_day)
+                & (pd.to_datetime(self.sales["sale_date"]) > pd.Timestamp(last_day) - pd.Timedelta(days=LATE_DAYS)))
+        late = late & (self.sales["store_id"] == self.sales.loc[late, "store_id"].iloc[0])
+        self.assertTrue(late.any())
+        first, state, _ = update_rolling_features(self.sales[~late])
+        second, state, skipped = update_rolling_features(self.sales[late], state)
+        self.assertEqual(skipped, 0)
+        self.assertTrue((second["day"] < state["day"].max()).any(), "Processed days not recomputed")
+        self.assert_matches_full_recompute(self.apply_update(first, second))
+
+    def test_sale_older_than_late_days_is_skipped_and_counted(self):
+        oldest = self.sales["sale_date"] == self.sales["sale_date"].min()
+        first, state, _ = update_rolling_features(self.sales[~oldest])
+        second, _, skipped = update_rolling_features(self.sales[oldest], state)
+        self.assertEqual(skipped, int(oldest.sum()))
+        self.assertTrue(second.empty)
+
+
+# Run the tests with verbosity=2 for detailed output
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,184 @@
+r"""
+tests/test_raw_ingest.py
+
+To run, open a terminal in the root project folder.
+Activate your virtual environment if needed, and run one of the following commands:
+
+    py tests\test_raw_ingest.py
+    python3 tests\test_raw_ingest.py
+
+This test suite verifies multi-file raw ingestion in scripts/raw_ingest.py.
+"""
+
+import unittest
+import os
+import pathlib
+import shutil
+import sys
+import tempfile
+from unittest import mock
+import pandas as pd
+
+# For local imports, temporarily add project root to Python sys.path
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from scripts import data_prep  # noqa: E402
+from scripts.raw_ingest import IngestLedger, read_csv_files, resolve_raw_sources  # noqa: E402
+
+
+class TestRawIngest(unittest.TestCase):
+
+    def setUp(self):
+        """Write a few small per-store, per-day sales drops to a temporary folder."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.raw_dir = pathlib.Path(self.temp_dir.name)
+        for store in (401, 402, 403):
+            for day in (1, 2):
+                df = pd.DataFrame({"TransactionID": [store * 10 + day], "StoreID": [store], "Day": [day]})
+                df.to_csv(self.raw_dir.joinpath(f"sales_data_{store}_{day:02d}.csv"), index=False)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_glob_reads_all_files_in_order(self):
+        paths = resolve_raw_sources("sales_data_*.csv", self.raw_dir)
+        df = read_csv_files(paths, max_workers=3, max_in_flight=2)
+        self.assertEqual(df["TransactionID"].tolist(), [4011, 4012, 4021, 4022, 4031, 4032], "Rows not in file order")
+        self.assertEqual(df.index.tolist(), list(range(6)), "Index not reset after concatenation")
+
+    def test_manifest_keeps_listed_order(self):
+        self.raw_dir.joinpath("today.manifest").write_text("# latest drops\nsales_data_403_02.csv\nsales_data_401_01.csv\n")
+        paths = resolve_raw_sources("today.manifest", self.raw_dir)
+        df = read_csv_files(paths)
+        self.assertEqual(df["TransactionID"].tolist(), [4032, 4011], "Manifest order not kept")
+
+    def test_missing_sources_raise(self):
+        with self.assertRaises(FileNotFoundError):
+            resolve_raw_sources("returns_*.csv", self.raw_dir)
+        with self.assertRaises(FileNotFoundError):
+            resolve_raw_sources("sales_data_999_01.csv", self.raw_dir)
+
+    def test_ledger_skips_files_already_ingested(self):
+        ledger_path = self.raw_dir.joinpath(".ingested.json")
+        ledger = IngestLedger(ledger_path)
+        first = read_csv_files(resolve_raw_sources("sales_data_*.csv", self.raw_dir), ledger=ledger)
+        self.assertEqual(len(first), 6)
+        ledger.commit()
+
+        pd.DataFrame({"TransactionID": [4043], "StoreID": [404], "Day": [3]}).to_csv(
+            self.raw_dir.joinpath("sales_data_404_03.csv"), index=False)
+        rerun = IngestLedger(ledger_path)
+        second = read_csv_files(resolve_raw_sources("sales_data_*.csv", self.raw_dir), ledger=rerun)
+        self.assertEqual(second["TransactionID"].tolist(), [4043], "Only the new file should be read")
+
+        # Without a commit the new file is read again on the next run
+        self.assertEqual(len(read_csv_files(resolve_raw_sources("sales_data_*.csv", self.raw_dir),
+                                            ledger=IngestLedger(ledger_path))), 1)
+
+    def test_ledger_reports_changed_and_removed_files(self):
+        ledger_path = self.raw_dir.joinpath(".ingested.json")
+        ledger = IngestLedger(ledger_path)
+        read_csv_files(resolve_raw_sources("sales_data_*.csv", self.raw_dir), ledger=ledger)
+        ledger.commit()
+
+        changed = self.raw_dir.joinpath("sales_data_401_01.csv")
+        stat = changed.stat()
+        os.utime(changed, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.raw_dir.joinpath("sales_data_403_02.csv").unlink()
+
+        rerun = IngestLedger(ledger_path)
+        paths = resolve_raw_sources("sales_data_*.csv", self.raw_dir)
+        self.assertEqual(rerun.changed_files(paths), ["sales_data_401_01.csv", "sales_data_403_02.csv"])
+
+        rerun.reset()
+        self.assertEqual(len(read_csv_files(paths, ledger=rerun)), 5, "All current files should be read after a reset")
+        rerun.commit()
+        self.assertEqual(IngestLedger(ledger_path).changed_files(paths), [], "Ledger not rebuilt from current files")
+
+
+class TestSalesPrepReruns(unittest.TestCase):
+
+    def setUp(self):
+        """Copy the raw data to a temporary project so data_prep.main() can run against it."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        root = pathlib.Path(self.temp_dir.name)
+        self.raw_dir, self.prepared_dir = root.joinpath("raw"), root.joinpath("prepared")
+        shutil.copytree(PROJECT_ROOT.joinpath("data", "raw"), self.raw_dir,
+                        ignore=shutil.ignore_patterns(".sales_ingested.json"))
+        self.prepared_dir.mkdir()
+        patches = [
+            mock.patch.object(data_prep, "RAW_DATA_DIR", self.raw_dir),
+            mock.patch.object(data_prep, "PREPARED_DATA_DIR", self.prepared_dir),
+            mock.patch.object(data_prep, "SALES_INGEST_LEDGER", self.raw_dir.joinpath(".sales_ingested.json")),
+            mock.patch.object(data_prep, "init_logger", lambda: None),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def prepared_sales(self) -> pd.DataFrame:
+        return pd.read_csv(self.prepared_dir.joinpath("sales_data_prepared.csv"))
+
+    def test_changed_file_replaces_its_rows(self):
+        data_prep.main()
+        first = self.prepared_sales()
+
+        # A re-copied or corrected upload of a file that was already ingested
+        sales_file = self.raw_dir.joinpath("sales_data.csv")
+        stat = sales_file.stat()
+        os.utime(sales_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        data_prep.main()
+        self.assertEqual(len(self.prepared_sales()), len(first), "Changed file's rows were appended again")
+        self.assertFalse(self.prepared_sales()["TransactionID"].duplicated().any(), "Duplicate TransactionIDs")
+
+        # A new drop is still appended
+        new_drop = first.head(1).copy()
+        new_drop["TransactionID"] = first["TransactionID"].max() + 1
+        new_drop.to_csv(self.raw_dir.joinpath("sales_data_999_01.csv"), index=False)
+        data_prep.main()
+        self.assertEqual(len(self.prepared_sales()), len(first) + 1, "New drop not appended")
+
+    def test_resent_drop_under_new_name_is_not_appended_again(self):
+        data_prep.main()
+        first = self.prepared_sales()
+
+        # Three rows already ingested, re-sent in a new file alongside one new sale
+        resend = pd.read_csv(self.raw_dir.joinpath("sales_data.csv")).head(4)
+        resend.loc[3, "TransactionID"] = first["TransactionID"].max() + 1
+        resend.to_csv(self.raw_dir.joinpath("sales_data_401_resend.csv"), index=False)
+        warnings = []
+        sink = data_prep.logger.add(warnings.append, level="WARNING", format="{message}")
+        self.addCleanup(data_prep.logger.remove, sink)
+        data_prep.main()
+        prepared = self.prepared_sales()
+        self.assertEqual(len(prepared), len(first) + 1, "Only the new sale should be appended")
+        self.assertTrue(any("Dropped 3 rows whose TransactionID" in w for w in warnings), "Dropped rows not logged")
+        self.assertFalse(prepared["TransactionID"].duplicated().any(), "Duplicate TransactionIDs")
+
+    def test_new_drop_columns_follow_prepared_header(self):
+        data_prep.main()
+        first = self.prepared_sales()
+
+        # A drop with the same columns in a different order
+        new_drop = first.head(1).copy()
+        new_drop["TransactionID"] = first["TransactionID"].max() + 1
+        new_drop[list(reversed(new_drop.columns))].to_csv(self.raw_dir.joinpath("sales_data_999_01.csv"), index=False)
+        data_prep.main()
+        appended = self.prepared_sales().tail(1).reset_index(drop=True)
+        pd.testing.assert_frame_equal(appended, new_drop.reset_index(drop=True), check_dtype=False)
+
+        # A drop with a different set of columns cannot be appended
+        new_drop.drop(columns=["StoreID"]).assign(TransactionID=new_drop["TransactionID"] + 1).to_csv(
+            self.raw_dir.joinpath("sales_data_999_02.csv"), index=False)
+        with self.assertRaises(ValueError):
+            data_prep.main()
+
+
+# Run the tests with verbosity=2 for detailed output
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
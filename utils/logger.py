@@ -9,6 +9,9 @@ Logging is an essential way to track events and issues during execution.
 Features:
 - Logs information, warnings, and errors to a designated log file.
 - Ensures the log directory exists.
+
+Importing this module has no side effects. Call init_logger() once at the 
+start of a run to create the log folder and start writing to the log file.
 """
 
 # Imports from Python Standard Library
@@ -20,25 +23,35 @@ from loguru import logger
 # Get this file name without the extension
 CURRENT_SCRIPT = pathlib.Path(__file__).stem
 
-# Set directory where logs will be stored
-LOG_FOLDER: pathlib.Path = pathlib.Path("logs")
+# Set directory where logs will be stored (in the project root, wherever the run starts)
+LOG_FOLDER: pathlib.Path = pathlib.Path(__file__).resolve().parent.parent.joinpath("logs")
 
 # Set the name of the log file
 LOG_FILE: pathlib.Path = LOG_FOLDER.joinpath("project_log.log")
 
-# Ensure the log folder exists or create it
-try:
-    LOG_FOLDER.mkdir(exist_ok=True)
-    logger.info(f"Log folder created at: {LOG_FOLDER}")
-except Exception as e:
-    logger.error(f"Error creating log folder: {e}")
+# Loguru sink id for the log file, once init_logger() has run
+_file_sink_id = None
+
+
+def init_logger() -> None:
+    """Create the log folder and add the log file sink. Safe to call more than once."""
+    global _file_sink_id
+    if _file_sink_id is not None:
+        return
+
+    # Ensure the log folder exists or create it
+    try:
+        LOG_FOLDER.mkdir(exist_ok=True)
+        logger.info(f"Log folder created at: {LOG_FOLDER}")
+    except Exception as e:
+        logger.error(f"Error creating log folder: {e}")
 
-# Configure Loguru to write to the log file
-try:
-    logger.add(LOG_FILE, level="INFO")
-    logger.info(f"Logging to file: {LOG_FILE}")
-except Exception as e:
-    logger.error(f"Error configuring logger to write to file: {e}")
+    # Configure Loguru to write to the log file
+    try:
+        _file_sink_id = logger.add(LOG_FILE, level="INFO")
+        logger.info(f"Logging to file: {LOG_FILE}")
+    except Exception as e:
+        logger.error(f"Error configuring logger to write to file: {e}")
 
 
 def get_log_file_path() -> pathlib.Path:
@@ -58,6 +71,7 @@ def log_example() -> None:
 
 def main() -> None:
     """Main function to execute logger setup and demonstrate its usage."""
+    init_logger()
     logger.info(f"STARTING {CURRENT_SCRIPT}.py")
 
     # Call the example logging function